@@ -23,7 +23,7 @@ def _find_tmp_dirs(repo_root: Path) -> List[Path]:
                 tmp_dirs.append(p)
 
     for job_dir in artifacts_root.iterdir():
-        if not job_dir.is_dir() or job_dir.name == "runs":
+        if not job_dir.is_dir() or job_dir.name in {"runs", "_index", "cache"}:
             continue
         job_tmp = job_dir / ".tmp"
         if job_tmp.exists():
@@ -30,7 +30,7 @@ def _discover_run_dirs(repo_root: Path) -> List[Tuple[Path, str]]:
     for job_dir in artifacts_root.iterdir():
         if not job_dir.is_dir():
             continue
-        if job_dir.name in {"runs", ".git"}:
+        if job_dir.name in {"runs", "_index", "cache", ".git"}:
             continue
         for run_dir in job_dir.iterdir():
             if not run_dir.is_dir() or run_dir.name.startswith("."):
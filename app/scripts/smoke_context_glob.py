@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Context glob selection smoke checks.
+
+_select_context_files matches selector globs against one in-memory listing
+of the selector root instead of calling Path.glob per pattern. Selection
+order feeds the materialized context hash, so it must stay identical to the
+original logic:
+
+    matched = [p for pat in include for p in sorted(root.glob(pat)) if p.is_file()]
+    excluded = {p for pat in exclude for p in root.glob(pat)}
+    selected = [p for p in matched if p not in excluded][:max_files]
+
+The fixture tree covers nested directories, dotfiles, names needing
+escaping, a symlinked directory, a symlinked file and a symlink loop.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sigilzero.core.schemas import ContextSelector, ContextSpec
+from sigilzero.pipelines.phase0_instagram_copy import _select_context_files
+
+
+FIXTURE_FILES = [
+    "Brand_Voice.md",
+    ".hidden.md",
+    "notes.txt",
+    "a b.md",
+    "identity/Brand_Voice.md",
+    "identity/.draft.md",
+    "identity/visual/palette.md",
+    "strategy/Positioning.md",
+    "strategy/Marketing_Principles.md",
+    "strategy/archive/2023/Positioning.md",
+    "strategy/archive/2023/notes.txt",
+    ".private/secret.md",
+    "[x]/bracket.md",
+]
+
+INCLUDE_SETS = [
+    ["*.md"],
+    ["**/*.md"],
+    ["identity/*.md"],
+    ["identity/**/*.md"],
+    ["strategy/**/*.md", "identity/*.md"],
+    ["*/*.md"],
+    ["**"],
+    ["**/**/*.md"],
+    ["?????????.md", "[ab]*.md"],
+    ["linked/*.md", "linked/**/*.md"],
+    ["loop/identity/*.md", "loop/loop/strategy/*.md"],
+    ["**/archive/*/*"],
+    ["strategy/Positioning.md", "identity/Brand_Voice.md"],
+    ["missing/*.md", "notes.txt/*.md"],
+    ["[[]x]/*.md"],
+]
+
+EXCLUDE_SETS = [
+    [],
+    ["**/archive/**"],
+    ["identity/*.md"],
+    ["**/.*"],
+]
+
+
+def _build_fixture(root: Path) -> None:
+    for rel in FIXTURE_FILES:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rel, encoding="utf-8")
+    (root / "linked").symlink_to(root / "identity", target_is_directory=True)
+    (root / "loop").symlink_to(root, target_is_directory=True)
+    (root / "strategy" / "voice.md").symlink_to(root / "Brand_Voice.md")
+
+
+def _baseline_select(root: Path, include: List[str], exclude: List[str], max_files: int) -> List[Path]:
+    matched: List[Path] = []
+    for pat in include:
+        matched.extend(p for p in sorted(root.glob(pat)) if p.is_file())
+    excluded = set()
+    for pat in exclude:
+        excluded.update(root.glob(pat))
+    return [p for p in matched if p not in excluded][:max_files]
+
+
+def main() -> int:
+    print("=" * 60)
+    print("Context glob selection smoke checks")
+    print("=" * 60)
+
+    checked = 0
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_root = Path(tmp)
+        root = repo_root / "corpus"
+        _build_fixture(root)
+
+        for include in INCLUDE_SETS:
+            for exclude in EXCLUDE_SETS:
+                for max_files in (3, 200):
+                    selector = ContextSelector(
+                        root="corpus",
+                        include_globs=include,
+                        exclude_globs=exclude,
+                        max_files=max_files,
+                    )
+                    spec = ContextSpec(selectors=[selector])
+                    expected = _baseline_select(root, include, exclude, max_files)
+                    actual = _select_context_files(str(repo_root), spec)
+                    checked += 1
+                    if actual != expected:
+                        failures += 1
+                        print(f"✗ include={include} exclude={exclude} max_files={max_files}")
+                        print(f"  expected: {[str(p.relative_to(root)) for p in expected]}")
+                        print(f"  actual:   {[str(p.relative_to(root)) for p in actual]}")
+
+    if failures:
+        print(f"✗ {failures}/{checked} selections differ from Path.glob")
+        return 1
+
+    print(f"✓ All {checked} selections match Path.glob")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -13,10 +13,11 @@ This module provides tools to verify determinism invariants:
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
 
+import orjson
+
 from .hashing import sha256_bytes, compute_inputs_hash, derive_run_id
 from .schemas import RunManifest
 
@@ -54,8 +55,7 @@ class SnapshotValidator:
         
         # Load manifest to get declared snapshots
         try:
-            with manifest_path.open("r") as f:
-                manifest_data = json.load(f)
+            manifest_data = orjson.loads(manifest_path.read_bytes())
         except Exception as e:
             errors.append(f"Failed to load manifest: {e}")
             return False, errors
@@ -88,8 +88,7 @@ class SnapshotValidator:
         manifest_path = run_dir / "manifest.json"
         
         try:
-            with manifest_path.open("r") as f:
-                manifest_data = json.load(f)
+            manifest_data = orjson.loads(manifest_path.read_bytes())
         except Exception as e:
             errors.append(f"Failed to load manifest: {e}")
             return False, errors
@@ -152,8 +151,7 @@ class DeterminismVerifier:
         # Check 3: inputs_hash derivation (manifest-declared snapshots, not hardcoded allowlist)
         manifest_path = run_dir / "manifest.json"
         try:
-            with manifest_path.open("r") as f:
-                manifest_data = json.load(f)
+            manifest_data = orjson.loads(manifest_path.read_bytes())
             
             # Reconstruct inputs_hash from EXACTLY the snapshots declared in manifest
             # Do NOT use a hardcoded allowlist - use what the manifest declares
@@ -191,8 +189,7 @@ class DeterminismVerifier:
         
         # Check 4: run_id derivation
         try:
-            with manifest_path.open("r") as f:
-                manifest_data = json.load(f)
+            manifest_data = orjson.loads(manifest_path.read_bytes())
             
             inputs_hash = manifest_data.get("inputs_hash")
             recorded_run_id = manifest_data.get("run_id")
@@ -220,8 +217,7 @@ class DeterminismVerifier:
         try:
             brief_path = run_dir / "inputs" / "brief.resolved.json"
             if brief_path.exists():
-                with brief_path.open("r") as f:
-                    brief_data = json.load(f)
+                brief_data = orjson.loads(brief_path.read_bytes())
                 brief_job_id = brief_data.get("job_id")
                 recorded_job_id = manifest_data.get("job_id")
                 
@@ -262,7 +258,7 @@ class DeterminismVerifier:
                         chainable_errors.append("prior_artifact.resolved.json snapshot not found")
                     else:
                         try:
-                            prior_artifact_data = json.loads(prior_artifact_path.read_text())
+                            prior_artifact_data = orjson.loads(prior_artifact_path.read_bytes())
                             # Check required fields for drift detection
                             required_fields = ["prior_run_id", "prior_output_hashes", "required_outputs"]
                             for field in required_fields:
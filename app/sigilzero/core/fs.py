@@ -2,8 +2,23 @@ from __future__ import annotations
 
 import json
 import os
+import secrets
+import shutil
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+import orjson
+
+from .hashing import sha256_bytes
+
+
+_FICLONE = 0x40049409  # linux/fs.h: reflink the whole file
 
 
 def ensure_dir(path: Path | str) -> Path:
@@ -13,26 +28,140 @@ def ensure_dir(path: Path | str) -> Path:
     return p
 
 
+def ensure_run_dirs(run_dir: Path | str, subdirs: Iterable[str] = ("inputs", "outputs")) -> Path:
+    """Create run_dir (with parents) and its immediate subdirectories.
+
+    The ancestor chain is resolved once for run_dir; each child is then a
+    single mkdir instead of another parents=True walk.
+    """
+    p = ensure_dir(run_dir)
+    for name in subdirs:
+        (p / name).mkdir(exist_ok=True)
+    return p
+
+
+def new_temp_id() -> str:
+    """Name for a staging run directory: "tmp-" + ms timestamp + random suffix.
+
+    The fixed-width hex timestamp makes names sort by creation time, so
+    staging dirs list (and age out in cleanup_tmp) oldest first. Only
+    staging dirs use this; run_id stays derived from inputs_hash.
+    """
+    return f"tmp-{time.time_ns() // 1_000_000:012x}{secrets.token_hex(5)}"
+
+
 def write_text(path: Path | str, content: str) -> None:
     """Write text content to file, creating parent directories as needed."""
+    write_bytes(path, content.encode("utf-8"))
+
+
+def write_bytes(path: Path | str, data: bytes) -> None:
+    """Write raw bytes to file, creating parent directories as needed."""
     p = Path(path)
-    ensure_dir(p.parent)
-    p.write_text(content, encoding="utf-8")
+    # Parents usually exist already; only create them when the write says so
+    try:
+        p.write_bytes(data)
+    except FileNotFoundError:
+        ensure_dir(p.parent)
+        p.write_bytes(data)
 
 
-def write_json(path: Path | str, data: Any) -> None:
-    """Write JSON data to file with canonical deterministic formatting.
+def write_bytes_atomic(path: Path | str, data: bytes) -> None:
+    """Write bytes via a sibling temp file and os.replace().
+
+    Readers see either the previous file or the complete new one, never a
+    partial write.
+    """
+    p = Path(path)
+    tmp = p.with_name(f".{p.name}.tmp")
+    write_bytes(tmp, data)
+    os.replace(tmp, p)
+
+
+def json_bytes(data: Any) -> bytes:
+    """Serialize JSON data to bytes with canonical deterministic formatting.
     
     Phase 1.0 Determinism: JSON snapshots must be byte-stable for hashing.
     - sort_keys=True for deterministic key order
     - ensure_ascii=False to preserve Unicode
     - indent=2 for readability (stable whitespace)
     - trailing newline enforced
+    
+    Use this to hash snapshot bytes in memory and write the same buffer,
+    instead of write_json() followed by reading the file back.
     """
-    p = Path(path)
-    ensure_dir(p.parent)
     json_str = json.dumps(data, sort_keys=True, ensure_ascii=False, indent=2)
     # Enforce trailing newline for POSIX compliance and git-friendliness
     if not json_str.endswith("\n"):
         json_str += "\n"
-    p.write_text(json_str, encoding="utf-8")
+    return json_str.encode("utf-8")
+
+
+def write_and_hash_json(path: Path | str, data: Any) -> Tuple[bytes, str]:
+    """Serialize a snapshot once, write it, and hash the same buffer.
+
+    Returns (snapshot bytes, sha256 in "sha256:..." format).
+    """
+    payload = json_bytes(data)
+    write_bytes(path, payload)
+    return payload, sha256_bytes(payload)
+
+
+def manifest_bytes(model: Any) -> bytes:
+    """Serialize a run manifest (Pydantic model): sorted keys, 2-space indent, trailing newline.
+
+    Manifests are not hashed, so this uses orjson. The layout matches
+    json_bytes, but orjson writes NaN/Infinity as null and does not accept
+    integers wider than 64 bits. model_dump(mode="json") first turns keys
+    into strings and values into JSON types, as json.dumps would.
+    """
+    return (
+        orjson.dumps(
+            model.model_dump(mode="json"),
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2,
+        )
+        + b"\n"
+    )
+
+
+def write_json(path: Path | str, data: Any) -> None:
+    """Write JSON data to file with canonical deterministic formatting (see json_bytes)."""
+    write_bytes(path, json_bytes(data))
+
+
+def fast_copy(src: Path | str, dst: Path | str) -> None:
+    """Copy a file, preferring strategies that avoid moving bytes through Python.
+    
+    Tries, in order: hardlink, reflink (FICLONE on CoW filesystems),
+    os.sendfile (kernel-space copy), then shutil.copy2.
+    
+    Only use for files that are immutable once written (e.g. input snapshots):
+    the hardlink strategy shares the inode with src.
+    """
+    src, dst = str(src), str(dst)
+    try:
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            if fcntl is not None:
+                try:
+                    fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+                    return
+                except OSError:
+                    pass
+            remaining = os.fstat(fsrc.fileno()).st_size
+            offset = 0
+            while remaining > 0:
+                sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+            if remaining == 0:
+                return
+    except OSError:
+        pass
+    shutil.copy2(src, dst)
@@ -0,0 +1,115 @@
+"""File hash cache keyed by stat identity.
+
+Finalized artifacts are immutable, so a file whose (dev, inode, mtime_ns, size)
+is unchanged does not need to be re-read to know its digest. Chained stages and
+idempotent replays hash the same prior outputs repeatedly; this cache turns
+those re-hashes into an index lookup.
+
+The cache is a local SQLite database (WAL mode). It is an optimization only:
+if it cannot be opened or written, hashing falls back to reading the file.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .hashing import hash_fileobj
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+  dev INTEGER NOT NULL,
+  ino INTEGER NOT NULL,
+  mtime_ns INTEGER NOT NULL,
+  size INTEGER NOT NULL,
+  algo TEXT NOT NULL,
+  digest TEXT NOT NULL,
+  PRIMARY KEY (dev, ino, mtime_ns, size, algo)
+)
+"""
+
+# Files modified this recently are hashed but not cached (see cached_hash_file).
+_MIN_AGE_S = 2.0
+
+_lock = threading.Lock()
+_conn: Optional[sqlite3.Connection] = None
+_disabled = False
+
+
+def get_state_db_path() -> Path:
+    """Location of the local state DB (SIGILZERO_STATE_DB, default ~/.sigilzero/state.db)."""
+    return Path(os.getenv("SIGILZERO_STATE_DB", str(Path.home() / ".sigilzero" / "state.db")))
+
+
+def _get_conn() -> Optional[sqlite3.Connection]:
+    """Open the cache connection once; disable the cache on any failure."""
+    global _conn, _disabled
+    if _conn is not None or _disabled:
+        return _conn
+    if os.getenv("SIGILZERO_HASH_CACHE", "1") == "0":
+        _disabled = True
+        return None
+    try:
+        db_path = get_state_db_path()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(_SCHEMA)
+        conn.commit()
+        _conn = conn
+    except Exception:
+        _disabled = True
+    return _conn
+
+
+def cached_hash_file(path: Path | str, algo: str = "sha256") -> Tuple[str, int]:
+    """Hash a file, reusing a cached digest when its stat identity is unchanged.
+
+    The stat is taken on the handle that is hashed. Digests are only stored
+    for files that were not modified within the last _MIN_AGE_S seconds and
+    did not change while being hashed: a same-size rewrite within the
+    filesystem's timestamp granularity would otherwise keep the stale digest.
+
+    Returns (digest in "<algo>:<hex>" format, size in bytes).
+    """
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        key = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size, algo)
+
+        with _lock:
+            conn = _get_conn()
+            if conn is not None:
+                try:
+                    row = conn.execute(
+                        "SELECT digest FROM files WHERE dev=? AND ino=? AND mtime_ns=? AND size=? AND algo=?",
+                        key,
+                    ).fetchone()
+                    if row is not None:
+                        return row[0], st.st_size
+                except Exception:
+                    pass
+
+        digest = hash_fileobj(f, algo)
+        after = os.fstat(f.fileno())
+
+    settled = time.time_ns() - st.st_mtime_ns > _MIN_AGE_S * 1e9
+    unchanged = (after.st_mtime_ns, after.st_size) == (st.st_mtime_ns, st.st_size)
+    if settled and unchanged:
+        with _lock:
+            if conn is not None:
+                try:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO files (dev, ino, mtime_ns, size, algo, digest) VALUES (?, ?, ?, ?, ?, ?)",
+                        (*key, digest),
+                    )
+                    conn.commit()
+                except Exception:
+                    pass
+
+    return digest, st.st_size
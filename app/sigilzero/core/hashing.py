@@ -2,12 +2,32 @@ from __future__ import annotations
 
 import hashlib
 import json
-from typing import Any, Dict, Iterable, Tuple
+import mmap
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Tuple
+
+try:
+    import blake3 as _blake3
+except Exception:  # pragma: no cover
+    _blake3 = None  # type: ignore
+
+
+# Opt-in algorithm for per-file leaf hashes (e.g. prior output files).
+# SHA-256 stays the default; hashlib dispatches to OpenSSL, which already uses
+# SHA-NI on CPUs that support it.
+LEAF_HASH_ALGOS = ("sha256", "blake3")
+
+
+# Built once: json.dumps() constructs a new encoder on every call that passes
+# non-default options. Output is identical to
+# json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False)
 
 
 def canonical_json(obj: Any) -> str:
     """Canonical JSON for stable hashing: sorted keys, no whitespace."""
-    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return _CANONICAL_ENCODER.encode(obj)
 
 
 def sha256_bytes(data: bytes) -> str:
@@ -16,6 +36,48 @@ def sha256_bytes(data: bytes) -> str:
     return "sha256:" + h.hexdigest()
 
 
+def get_leaf_hash_algo() -> str:
+    """Return the configured leaf hash algorithm (SIGILZERO_HASH_ALGO, default sha256)."""
+    algo = os.getenv("SIGILZERO_HASH_ALGO", "sha256").strip().lower() or "sha256"
+    if algo not in LEAF_HASH_ALGOS:
+        raise ValueError(f"Unsupported SIGILZERO_HASH_ALGO: {algo}")
+    return algo
+
+
+def hash_file(path: Path | str, algo: str = "sha256") -> str:
+    """Stream-hash a file with the given leaf algorithm.
+
+    Returns "<algo>:<hex>" so the algorithm is recorded alongside the digest.
+    blake3 memory-maps the file and hashes it multi-threaded; it must be
+    installed explicitly (no silent fallback, since that would change hashes).
+    """
+    if algo == "blake3":
+        if _blake3 is None:
+            raise RuntimeError("SIGILZERO_HASH_ALGO=blake3 requires the 'blake3' package")
+        h = _blake3.blake3(max_threads=_blake3.blake3.AUTO)
+        h.update_mmap(str(path))
+        return "blake3:" + h.hexdigest()
+    if algo != "sha256":
+        raise ValueError(f"Unsupported leaf hash algorithm: {algo}")
+    with open(path, "rb") as f:
+        return hash_fileobj(f, algo)
+
+
+def hash_fileobj(f: BinaryIO, algo: str = "sha256") -> str:
+    """Hash an already-open binary file from its current position (see hash_file)."""
+    if algo == "blake3":
+        if _blake3 is None:
+            raise RuntimeError("SIGILZERO_HASH_ALGO=blake3 requires the 'blake3' package")
+        h = _blake3.blake3(max_threads=_blake3.blake3.AUTO)
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+        return "blake3:" + h.hexdigest()
+    if algo != "sha256":
+        raise ValueError(f"Unsupported leaf hash algorithm: {algo}")
+    return "sha256:" + hashlib.file_digest(f, "sha256").hexdigest()
+
+
 def sha256_text(text: str) -> str:
     return sha256_bytes(text.encode("utf-8"))
 
@@ -27,9 +89,12 @@ def sha256_json(obj: Any) -> str:
 
 
 def hash_pydantic_model(model: Any, *, exclude: Iterable[str] = ()) -> str:
-    """Hash a Pydantic model (v1 or v2) by dumping to dict then canonicalizing."""
+    """Hash a Pydantic model (v1 or v2) by dumping to dict then canonicalizing.
+
+    warnings=False skips serializer warning collection; the dict is unchanged.
+    """
     try:
-        d = model.model_dump(exclude=set(exclude))  # pydantic v2
+        d = model.model_dump(exclude=set(exclude), warnings=False)  # pydantic v2
     except Exception:
         d = model.dict(exclude=set(exclude))  # pydantic v1
     return sha256_text(canonical_json(d))
@@ -63,6 +63,29 @@ class _NoOpTrace:
         return _NoOpSpan()
 
 
+def _create_client() -> Any:
+    """Construct the SDK client with batched, background event delivery.
+
+    Events are queued and flushed off-thread every LANGFUSE_FLUSH_INTERVAL
+    seconds (default 0.5) or LANGFUSE_FLUSH_AT events (default 100), so span
+    calls do not block the pipeline on HTTP.
+    """
+    kwargs: Dict[str, Any] = dict(
+        public_key=os.getenv("LANGFUSE_PUBLIC_KEY"),
+        secret_key=os.getenv("LANGFUSE_SECRET_KEY"),
+        host=os.getenv("LANGFUSE_HOST"),
+    )
+    try:
+        return Langfuse(
+            **kwargs,
+            flush_at=int(os.getenv("LANGFUSE_FLUSH_AT", "100")),
+            flush_interval=float(os.getenv("LANGFUSE_FLUSH_INTERVAL", "0.5")),
+        )
+    except TypeError:
+        # SDK version without batching options
+        return Langfuse(**kwargs)
+
+
 class LangfuseClient:
     """Thin wrapper for Langfuse tracing.
     
@@ -79,13 +102,11 @@ class LangfuseClient:
             and os.getenv("LANGFUSE_SECRET_KEY") 
             and os.getenv("LANGFUSE_HOST")
         )
+        if os.getenv("LANGFUSE_MODE", "").lower() == "off":
+            self.enabled = False
         if self.enabled and Langfuse is not None:
             try:
-                self._client = Langfuse(
-                    public_key=os.getenv("LANGFUSE_PUBLIC_KEY"),
-                    secret_key=os.getenv("LANGFUSE_SECRET_KEY"),
-                    host=os.getenv("LANGFUSE_HOST"),
-                )
+                self._client = _create_client()
             except Exception:
                 self._client = None
                 self.enabled = False
@@ -247,6 +268,47 @@ class LangfuseClient:
             span.end()
 
 
+class _SpanScope:
+    """Handle yielded by lf_span; set .output to record it when the span ends."""
+
+    __slots__ = ("span", "output")
+
+    def __init__(self, span: Any) -> None:
+        self.span = span
+        self.output: Any = None
+
+
+@contextmanager
+def lf_span(
+    lf: Optional[LangfuseClient],
+    trace_id: Optional[str],
+    name: str,
+    input: Any = None,
+    metadata: Optional[Dict[str, Any]] = None,
+):
+    """Span around a block that also works when tracing is disabled (lf is None).
+
+    Usage:
+        with lf_span(lf, trace_id, "generate", input={...}) as scope:
+            ...
+            scope.output = {"variants_count": 3}
+
+    The span is ended on exit, including when the block raises.
+    """
+    span = lf.span(trace_id=trace_id, name=name, input=input, metadata=metadata) if lf is not None else _NoOpSpan()
+    scope = _SpanScope(span)
+    try:
+        yield scope
+    finally:
+        try:
+            if scope.output is not None:
+                span.end(output=scope.output)
+            else:
+                span.end()
+        except Exception:
+            pass
+
+
 _langfuse_client: Optional[LangfuseClient] = None
 
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import threading
 from typing import Any, Dict, Optional
 
 try:
@@ -58,13 +59,16 @@ class ModelClient:
 
 
 _model_client: Optional[ModelClient] = None
+_model_client_lock = threading.Lock()
 
 
 def get_model_client() -> ModelClient:
-    """Get or create the global model client."""
+    """Get or create the global model client (safe to call from worker threads)."""
     global _model_client
     if _model_client is None:
-        _model_client = ModelClient()
+        with _model_client_lock:
+            if _model_client is None:
+                _model_client = ModelClient()
     return _model_client
 
 
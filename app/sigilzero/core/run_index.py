@@ -0,0 +1,51 @@
+"""Run index: O(1) lookup of a run directory by run_id.
+
+Layout: artifacts/_index/<run_id> -> ../<job_id>/<run_id> (relative symlink)
+
+The index is a derived convenience, like the legacy artifacts/runs aliases.
+The canonical artifacts/<job_id>/<run_id>/ directories remain authoritative;
+a missing or stale index entry only means callers fall back to scanning.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Optional
+
+
+RUN_INDEX_DIRNAME = "_index"
+
+# Top-level entries under artifacts/ that are not job directories.
+NON_JOB_DIRNAMES = {RUN_INDEX_DIRNAME, "runs", "cache", ".git", ".tmp"}
+
+
+def index_run(artifacts_root: Path, job_id: str, run_id: str) -> bool:
+    """Record artifacts/_index/<run_id> -> ../<job_id>/<run_id>.
+
+    Returns True if the index entry exists and points at the run afterwards.
+    """
+    index_dir = artifacts_root / RUN_INDEX_DIRNAME
+    link = index_dir / run_id
+    target = Path("..") / job_id / run_id
+    try:
+        index_dir.mkdir(parents=True, exist_ok=True)
+        if link.is_symlink():
+            if os.readlink(link) == str(target):
+                return True
+            link.unlink()
+        link.symlink_to(target)
+        return True
+    except OSError:
+        return False
+
+
+def resolve_indexed_run(artifacts_root: Path, run_id: str) -> Optional[Path]:
+    """Resolve a run directory through the index, or None on index miss."""
+    link = artifacts_root / RUN_INDEX_DIRNAME / run_id
+    if not link.is_symlink():
+        return None
+    run_dir = link.resolve()
+    if not (run_dir / "manifest.json").exists():
+        return None
+    return run_dir
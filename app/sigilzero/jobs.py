@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from rq import Queue, get_current_job
-from redis import Redis
+from redis import BlockingConnectionPool, Redis
 from typing import Any, Dict, Optional
 
 import yaml  # type: ignore
@@ -37,10 +38,23 @@ def resolve_pipeline(job_type: str):
     return pipeline_fn
 
 
+@lru_cache(maxsize=None)
 def get_redis() -> Redis:
-    return Redis.from_url(os.getenv("REDIS_URL", "redis://redis:6379/0"))
+    """Process-wide Redis client over a bounded, blocking connection pool.
+
+    Callers wait up to 5s for a free connection instead of opening an
+    unbounded number; redis-py resets the pool in forked RQ work horses.
+    """
+    pool = BlockingConnectionPool.from_url(
+        os.getenv("REDIS_URL", "redis://redis:6379/0"),
+        max_connections=32,
+        timeout=5,
+        health_check_interval=30,
+    )
+    return Redis(connection_pool=pool)
 
 
+@lru_cache(maxsize=None)
 def get_queue() -> Queue:
     return Queue("sigilzero", connection=get_redis())
 
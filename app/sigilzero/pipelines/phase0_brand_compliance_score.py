@@ -16,18 +16,24 @@ import json
 import os
 import shutil
 import time
-import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml-backed
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _YamlLoader  # type: ignore
+
 from sigilzero.core.doctrine import get_doctrine_loader
-from sigilzero.core.fs import ensure_dir, write_json
-from sigilzero.core.hashing import sha256_bytes, sha256_json, compute_inputs_hash, derive_run_id
-from sigilzero.core.langfuse_client import get_langfuse
+from sigilzero.core.fs import ensure_dir, ensure_run_dirs, json_bytes, manifest_bytes, new_temp_id, write_and_hash_json, write_bytes
+from sigilzero.core.hashing import sha256_bytes, hash_dict, compute_inputs_hash, derive_run_id
+from sigilzero.core.langfuse_client import get_langfuse, lf_span
 from sigilzero.core.model import generate_text
+from sigilzero.core.run_index import index_run
 from sigilzero.core.schemas import (
     DoctrineReference,
     GenerationSpec,
@@ -42,8 +48,7 @@ def _utc_now() -> str:
 
 def _read_yaml(path: Path) -> Dict[str, Any]:
     """Read YAML file, return dict."""
-    with path.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    return yaml.load(path.read_bytes(), Loader=_YamlLoader) or {}
 
 
 def _resolve_repo_path(repo_root: str, rel_path: str) -> Path:
@@ -115,10 +120,9 @@ def run_brand_compliance_score(
     job_root = Path(repo_root) / "artifacts" / job_id
     tmp_base = job_root / ".tmp"
     ensure_dir(tmp_base)
-    temp_id = f"tmp-{uuid.uuid4().hex[:16]}"
+    temp_id = new_temp_id()
     temp_dir = tmp_base / temp_id
-    ensure_dir(temp_dir / "inputs")
-    ensure_dir(temp_dir / "outputs")
+    ensure_run_dirs(temp_dir)
     
     # Phase 1.0 INVARIANT: Write canonical JSON snapshots FIRST
     # These snapshots are the source of truth for inputs_hash computation
@@ -128,9 +132,9 @@ def run_brand_compliance_score(
         k: v for k, v in brief_data.items()
         if k not in {"brief_hash", "repo_commit"}
     }
-    write_json(temp_dir / "inputs" / "brief.resolved.json", brief_resolved)
-    brief_snapshot_bytes = (temp_dir / "inputs" / "brief.resolved.json").read_bytes()
-    brief_snapshot_hash = sha256_bytes(brief_snapshot_bytes)
+    brief_snapshot_bytes, brief_snapshot_hash = write_and_hash_json(
+        temp_dir / "inputs" / "brief.resolved.json", brief_resolved
+    )
     
     # 2. Context snapshot (content + brand identity)
     content_to_score = brief_data.get("content", {})
@@ -158,9 +162,9 @@ def run_brand_compliance_score(
         "content_to_score": content_to_score,
         "evaluation_focus": brief_data.get("evaluation_focus", ""),
     }
-    write_json(temp_dir / "inputs" / "context.resolved.json", context_obj)
-    context_snapshot_bytes = (temp_dir / "inputs" / "context.resolved.json").read_bytes()
-    context_snapshot_hash = sha256_bytes(context_snapshot_bytes)
+    context_snapshot_bytes, context_snapshot_hash = write_and_hash_json(
+        temp_dir / "inputs" / "context.resolved.json", context_obj
+    )
     
     # 3. Model config (determinism)
     model_config = {
@@ -171,9 +175,9 @@ def run_brand_compliance_score(
         "max_tokens": 2000,
         "response_format": "json",
     }
-    write_json(temp_dir / "inputs" / "model_config.json", model_config)
-    model_snapshot_bytes = (temp_dir / "inputs" / "model_config.json").read_bytes()
-    model_snapshot_hash = sha256_bytes(model_snapshot_bytes)
+    model_snapshot_bytes, model_snapshot_hash = write_and_hash_json(
+        temp_dir / "inputs" / "model_config.json", model_config
+    )
     
     # 4. Doctrine (brand strategy snapshot) - Phase 1.0 governance requirement
     doctrine_loader = get_doctrine_loader(repo_root)
@@ -216,9 +220,9 @@ def run_brand_compliance_score(
         "sha256": doctrine_ref.sha256,
         "content": doctrine_content,
     }
-    write_json(temp_dir / "inputs" / "doctrine.resolved.json", doctrine_resolved)
-    doctrine_snapshot_bytes = (temp_dir / "inputs" / "doctrine.resolved.json").read_bytes()
-    doctrine_snapshot_hash = sha256_bytes(doctrine_snapshot_bytes)
+    doctrine_snapshot_bytes, doctrine_snapshot_hash = write_and_hash_json(
+        temp_dir / "inputs" / "doctrine.resolved.json", doctrine_resolved
+    )
     
     # Phase 1.0 BLOCKER 2 FIX: Load and snapshot prompt template BEFORE inputs_hash computation
     # Template participates in inputs_hash to ensure template changes → run_id changes (no silent drift)
@@ -238,9 +242,9 @@ def run_brand_compliance_score(
             "sha256": template_doctrine_ref.sha256,
             "content": prompt_template_raw,
         }
-        write_json(temp_dir / "inputs" / "prompt_template.resolved.json", template_resolved)
-        template_snapshot_bytes = (temp_dir / "inputs" / "prompt_template.resolved.json").read_bytes()
-        template_snapshot_hash = sha256_bytes(template_snapshot_bytes)
+        template_snapshot_bytes, template_snapshot_hash = write_and_hash_json(
+            temp_dir / "inputs" / "prompt_template.resolved.json", template_resolved
+        )
     except Exception as e:
         raise ValueError(f"Failed to load prompt template: {e}")
     
@@ -272,9 +276,7 @@ def run_brand_compliance_score(
         if not manifest_path.exists():
             return None
         try:
-            with manifest_path.open("r") as f:
-                data = json.load(f)
-                return data.get("inputs_hash")
+            return orjson.loads(manifest_path.read_bytes()).get("inputs_hash")
         except Exception:
             return None
     
@@ -437,56 +439,52 @@ def run_brand_compliance_score(
             channels=', '.join(content_to_score.get('channels', [])),
         )
         
-        if lf is not None and trace_id:
-            span_gen = lf.span(trace_id=trace_id, name="score_brand_compliance")
-        else:
-            span_gen = None
-        
-        # Build generation spec
-        gen_spec = GenerationSpec(
-            provider=model_config.get("provider", "openai"),
-            model=model_config.get("model", "gpt-4"),
-            temperature=model_config.get("temperature", 0),
-            top_p=model_config.get("top_p", 1.0),
-            prompt_template=template_id,
-            prompt_template_version=template_version,
-            context_content_hash=context_snapshot_hash,
-            response_schema="response_schemas/brand_compliance_score",
-            response_schema_version="v1.0.0",
-            cache_enabled=False,
-        )
-        gen_spec.generation_hash = sha256_json(gen_spec.model_dump(exclude={"generation_hash"}))
-        
-        # Call LLM
-        try:
-            gen_spec_dict = gen_spec.model_dump()
-            response_text = generate_text(
-                prompt=prompt,
-                generation_spec=gen_spec_dict,
+        with lf_span(lf, trace_id, "score_brand_compliance") as span_gen:
+            # Build generation spec
+            gen_spec = GenerationSpec(
+                provider=model_config.get("provider", "openai"),
+                model=model_config.get("model", "gpt-4"),
+                temperature=model_config.get("temperature", 0),
+                top_p=model_config.get("top_p", 1.0),
+                prompt_template=template_id,
+                prompt_template_version=template_version,
+                context_content_hash=context_snapshot_hash,
+                response_schema="response_schemas/brand_compliance_score",
+                response_schema_version="v1.0.0",
+                cache_enabled=False,
             )
-        except Exception as e:
-            raise RuntimeError(f"LLM call failed: {e}")
+            # Dump once: hash without generation_hash, then add it back for the call
+            gen_spec_dict = gen_spec.model_dump(exclude={"generation_hash"}, warnings=False)
+            gen_spec.generation_hash = hash_dict(gen_spec_dict)
+            gen_spec_dict["generation_hash"] = gen_spec.generation_hash
         
-        # Parse response
-        try:
-            # Handle JSON in code fence
-            if "```json" in response_text:
-                json_str = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                json_str = response_text.split("```")[1].split("```")[0].strip()
-            else:
-                json_str = response_text.strip()
-            
-            compliance_output = json.loads(json_str)
-        except json.JSONDecodeError as e:
-            raise RuntimeError(f"Failed to parse LLM response as JSON: {e}\nResponse: {response_text}")
+            # Call LLM
+            try:
+                response_text = generate_text(
+                    prompt=prompt,
+                    generation_spec=gen_spec_dict,
+                )
+            except Exception as e:
+                raise RuntimeError(f"LLM call failed: {e}")
         
-        if lf is not None and span_gen:
-            span_gen.end(output=compliance_output)
+            # Parse response
+            try:
+                # Handle JSON in code fence
+                if "```json" in response_text:
+                    json_str = response_text.split("```json")[1].split("```")[0].strip()
+                elif "```" in response_text:
+                    json_str = response_text.split("```")[1].split("```")[0].strip()
+                else:
+                    json_str = response_text.strip()
+            
+                compliance_output = json.loads(json_str)
+            except json.JSONDecodeError as e:
+                raise RuntimeError(f"Failed to parse LLM response as JSON: {e}\nResponse: {response_text}")
+
+            span_gen.output = compliance_output
         
         # Ensure final_run_dir exists
-        ensure_dir(final_run_dir / "inputs")
-        ensure_dir(final_run_dir / "outputs")
+        ensure_run_dirs(final_run_dir)
         
         # Copy inputs from temp to final (atomic finalization)
         # Copy exact snapshot filenames (model_config has no .resolved suffix)
@@ -506,8 +504,9 @@ def run_brand_compliance_score(
             else:
                 raise RuntimeError(f"Expected snapshot not found: {src}")
         
-        # Write outputs
-        write_json(final_run_dir / "outputs" / "compliance_scores.json", compliance_output)
+        # Write outputs (hash the buffer that is written, not a re-read)
+        scores_bytes = json_bytes(compliance_output)
+        write_bytes(final_run_dir / "outputs" / "compliance_scores.json", scores_bytes)
         
         # Finalize manifest
         manifest.status = "succeeded"
@@ -515,12 +514,13 @@ def run_brand_compliance_score(
         manifest.artifacts = {
             "compliance_scores": {
                 "path": "outputs/compliance_scores.json",
-                "sha256": sha256_bytes((final_run_dir / "outputs" / "compliance_scores.json").read_bytes()),
+                "sha256": sha256_bytes(scores_bytes),
             }
         }
         
         manifest_path = final_run_dir / "manifest.json"
-        write_json(manifest_path, manifest.model_dump(by_alias=False))
+        manifest_path.write_bytes(manifest_bytes(manifest))
+        index_run(Path(repo_root) / "artifacts", job_id, run_id)
         
         elapsed = time.monotonic() - started_monotonic
         print(
@@ -537,7 +537,8 @@ def run_brand_compliance_score(
         manifest.error = str(e)
         
         manifest_path = final_run_dir / "manifest.json"
-        write_json(manifest_path, manifest.model_dump(by_alias=False))
+        manifest_path.write_bytes(manifest_bytes(manifest))
+        index_run(Path(repo_root) / "artifacts", job_id, run_id)
         
         elapsed = time.monotonic() - started_monotonic
         print(
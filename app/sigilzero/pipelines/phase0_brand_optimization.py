@@ -18,35 +18,82 @@ DETERMINISM INVARIANTS ENFORCED:
 from __future__ import annotations
 
 import json
-import shutil
+import os
 import time
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import orjson
 import yaml
 
-from sigilzero.core.hashing import sha256_bytes, sha256_json, compute_inputs_hash, derive_run_id
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml-backed
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _YamlLoader  # type: ignore
+
+from sigilzero.core.hashing import (
+    sha256_bytes,
+    sha256_json,
+    compute_inputs_hash,
+    derive_run_id,
+    get_leaf_hash_algo,
+)
+from sigilzero.core.hash_cache import cached_hash_file
+from sigilzero.core.run_index import NON_JOB_DIRNAMES, index_run, resolve_indexed_run
 from sigilzero.core.schemas import (
     BriefSpec,
-    InputSnapshot,
     DoctrineReference,
     RunManifest,
     ChainInput,
     ChainedStage,
     ChainMetadata,
 )
-from sigilzero.core.fs import ensure_dir, write_json
+from sigilzero.core.fs import fast_copy, json_bytes, manifest_bytes
 from sigilzero.core.doctrine import get_doctrine_loader
 from sigilzero.core.langfuse_client import get_langfuse
 
 
-def _utc_now() -> str:
-    """Get current UTC timestamp in ISO format."""
-    return datetime.now(timezone.utc).isoformat()
+# Stage 8 inputs that never vary per run: serialize and hash once at import.
+# model_config bytes keep the stdlib json.dumps(sort_keys=True) format that
+# existing inputs_hash values were computed from.
+_MODEL_CONFIG: Dict[str, Any] = {"provider": "openai", "model": "gpt-4"}
+_MODEL_CONFIG_BYTES = json.dumps(_MODEL_CONFIG, sort_keys=True).encode("utf-8")
+_MODEL_CONFIG_HASH = sha256_bytes(_MODEL_CONFIG_BYTES)
+
+_DOCTRINE_ID = "brand_optimization"
+_DOCTRINE_VERSION = "v1.0.0"
+_DOCTRINE_CONTENT_HASH = sha256_bytes(b"{}")  # stage has no doctrine content yet
+
+_LEGACY_RUNS_ROOT = Path("/app/artifacts/runs")
+
+# Same output as json.dumps(..., sort_keys=True, ensure_ascii=False); built once
+# because json.dumps constructs a fresh encoder whenever options are passed.
+_PRIOR_ARTIFACT_ENCODER = json.JSONEncoder(sort_keys=True, ensure_ascii=False)
+
+
+def _utc_now(t: Optional[float] = None) -> str:
+    """Get a UTC timestamp in ISO format (now, or epoch seconds t).
+
+    Formatted with time.strftime instead of building a datetime; always
+    includes microseconds, e.g. 2024-01-01T00:00:00.000000+00:00.
+    """
+    if t is None:
+        t = time.time()
+    whole = int(t)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(whole)) + f".{int((t - whole) * 1_000_000):06d}+00:00"
+
+
+def _sha256_file(path: Path) -> Tuple[str, int]:
+    """Stream-hash a file without buffering it in memory.
+
+    Digests are cached by stat identity (see core.hash_cache).
+    Returns (sha256 in "sha256:..." format, size in bytes).
+    """
+    return cached_hash_file(path, "sha256")
 
 
 def _read_manifest_inputs_hash(dir_path: Path) -> Optional[str]:
@@ -55,9 +102,7 @@ def _read_manifest_inputs_hash(dir_path: Path) -> Optional[str]:
     if not manifest_path.exists():
         return None
     try:
-        with manifest_path.open("r") as f:
-            manifest = json.load(f)
-            return manifest.get("inputs_hash")
+        return orjson.loads(manifest_path.read_bytes()).get("inputs_hash")
     except Exception:
         return None
 
@@ -69,21 +114,23 @@ def _ensure_legacy_symlink(run_id: str, canonical_dir: Path) -> str:
     
     Returns: human-readable action description
     """
-    legacy_link = Path("/app/artifacts/runs") / run_id
+    legacy_link = _LEGACY_RUNS_ROOT / run_id
     legacy_link.parent.mkdir(parents=True, exist_ok=True)
     
-    # Remove existing symlink if broken or targeting elsewhere
-    if legacy_link.exists() or legacy_link.is_symlink():
-        try:
-            legacy_link.unlink()
-        except Exception:
-            pass
+    # Relative symlink: runs/d79bbc34... -> ../optimization-001/d79bbc34.../
+    relative_target = Path("..") / canonical_dir.parent.name / canonical_dir.name
     
-    # Create symlink to canonical location
+    # Build the link under a dot-prefixed temp name and atomically swap it in:
+    # replaces a stale or broken link without probing it first, and never
+    # leaves a window where the alias is missing.
+    tmp_link = legacy_link.with_name(f".{legacy_link.name}.tmp")
     try:
-        # Relative symlink: runs/d79bbc34... -> ../optimization-001/d79bbc34.../
-        relative_target = Path("..") / canonical_dir.parent.name / canonical_dir.name
-        legacy_link.symlink_to(relative_target)
+        try:
+            os.unlink(tmp_link)
+        except FileNotFoundError:
+            pass
+        os.symlink(relative_target, tmp_link)
+        os.replace(tmp_link, legacy_link)
         return f"legacy_alias_created:{legacy_link}->{relative_target}"
     except Exception as e:
         # Silently fail if symlink not supported (containerization edge case)
@@ -92,8 +139,12 @@ def _ensure_legacy_symlink(run_id: str, canonical_dir: Path) -> str:
 
 def _read_yaml(path: Path) -> Dict[str, Any]:
     """Read YAML file, return dict."""
-    with path.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    return yaml.load(path.read_bytes(), Loader=_YamlLoader) or {}
+
+
+def _read_prior_manifest(manifest_path: Path) -> Dict[str, Any]:
+    """Read a finalized manifest.json."""
+    return orjson.loads(manifest_path.read_bytes())
 
 
 def run_brand_optimization(
@@ -132,7 +183,7 @@ def run_brand_optimization(
     
     # Load job brief
     brief_yaml = _read_yaml(job_brief_path)
-    brief = BriefSpec(**brief_yaml)
+    brief = BriefSpec.model_validate(brief_yaml)
     
     if not brief.chain_inputs:
         raise ValueError(f"Brand optimization is chainable-only; chain_inputs required")
@@ -146,16 +197,24 @@ def run_brand_optimization(
     prior_artifact_dir = None
     prior_job_id = None
     
-    # Search for prior artifact in artifacts/<job_id>/<prior_run_id>/
+    # Resolve prior artifact via artifacts/_index/<prior_run_id> (O(1)); on an
+    # index miss, search artifacts/<job_id>/<prior_run_id>/ and backfill the index
     artifacts_root = repo_root / "artifacts"
-    for job_dir in artifacts_root.iterdir():
-        if not job_dir.is_dir():
-            continue
-        run_dir = job_dir / prior_run_id
-        if run_dir.exists() and (run_dir / "manifest.json").exists():
-            prior_artifact_dir = run_dir
-            prior_job_id = job_dir.name
-            break
+    indexed_run_dir = resolve_indexed_run(artifacts_root, prior_run_id)
+    if indexed_run_dir is not None:
+        prior_artifact_dir = indexed_run_dir
+        prior_job_id = indexed_run_dir.parent.name
+    else:
+        # scandir's cached d_type makes the is_dir() filter syscall-free
+        with os.scandir(artifacts_root) as entries:
+            for entry in entries:
+                if not entry.is_dir(follow_symlinks=False) or entry.name in NON_JOB_DIRNAMES:
+                    continue
+                if os.path.exists(os.path.join(entry.path, prior_run_id, "manifest.json")):
+                    prior_artifact_dir = Path(entry.path) / prior_run_id
+                    prior_job_id = entry.name
+                    index_run(artifacts_root, prior_job_id, prior_run_id)
+                    break
     
     if not prior_artifact_dir:
         raise ValueError(
@@ -171,295 +230,299 @@ def run_brand_optimization(
     
     # Load prior manifest
     prior_manifest_path = prior_artifact_dir / "manifest.json"
-    with prior_manifest_path.open("r") as f:
-        prior_manifest = json.load(f)
-    
-    # Create temporary work directory
-    temp_dir = repo_root / ".tmp" / f"optimize-{int(time.time() * 1000)}"
-    ensure_dir(temp_dir / "inputs")
-    ensure_dir(temp_dir / "outputs")
+    prior_manifest = _read_prior_manifest(prior_manifest_path)
     
+    started_wall = time.time()
     started_monotonic = time.monotonic()
     
-    try:
-        # Phase 1.0 INVARIANT: Load and snapshot all canonical inputs
-        
-        # 1. Brief snapshot
-        brief_snapshot_bytes = job_brief_path.read_bytes()
-        brief_snapshot_hash = sha256_bytes(brief_snapshot_bytes)
-        write_json(temp_dir / "inputs" / "brief.resolved.json", brief.model_dump())
-        
-        # 2. Context snapshot (load from context.resolved.json if exists)
-        context_snapshot_hash = None
-        context_snapshot_bytes = None
-        context_path = prior_artifact_dir / "inputs" / "context.resolved.json"
-        if context_path.exists():
-            context_snapshot_bytes = context_path.read_bytes()
-            context_snapshot_hash = sha256_bytes(context_snapshot_bytes)
-            shutil.copy2(context_path, temp_dir / "inputs" / "context.resolved.json")
-        else:
-            # If no context in prior, create empty
-            context_snapshot_bytes = b"{}"
-            context_snapshot_hash = sha256_bytes(context_snapshot_bytes)
-            write_json(temp_dir / "inputs" / "context.resolved.json", {})
-        
-        # 3. Model config snapshot
-        model_config = {"provider": "openai", "model": "gpt-4"}
-        model_snapshot_bytes = json.dumps(model_config, sort_keys=True).encode("utf-8")
-        model_snapshot_hash = sha256_bytes(model_snapshot_bytes)
-        write_json(temp_dir / "inputs" / "model_config.json", model_config)
-        
-        # 4. Doctrine (load from prior or create new)
-        # Phase 1.0: Even if stage doesn't use doctrine, snapshot it for consistency
-        # and to ensure any future doctrine dependency is captured deterministically
-        doctrine_content = "{}"
-        doctrine_id = "brand_optimization"
-        doctrine_version = "v1.0.0"
-        doctrine_content_hash = sha256_bytes(doctrine_content.encode("utf-8"))
-        
-        # Write doctrine snapshot with deterministic structure
-        doctrine_resolved = {
-            "doctrine_id": doctrine_id,
-            "version": doctrine_version,
-            "sha256": doctrine_content_hash,
-        }
-        write_json(temp_dir / "inputs" / "doctrine.resolved.json", doctrine_resolved)
-        doctrine_snapshot_bytes = (temp_dir / "inputs" / "doctrine.resolved.json").read_bytes()
-        doctrine_snapshot_hash = sha256_bytes(doctrine_snapshot_bytes)
-        
-        # 5. PHASE 8 CRITICAL: Prior artifact snapshot (participates in inputs_hash)
-        # This ensures: prior_run_id change → inputs_hash change → run_id change
-        # BLOCKER 2 FIX: Include sha256 of actual prior output files (no silent drift)
-        prior_output_hashes = {}
-        for output_file in required_outputs:
-            output_path = prior_artifact_dir / "outputs" / output_file
-            if output_path.exists():
-                output_bytes = output_path.read_bytes()
-                prior_output_hashes[output_file] = sha256_bytes(output_bytes)
-            else:
-                raise ValueError(f"Required output missing: {output_path}")
-        
-        prior_artifact_snapshot = {
-            "prior_run_id": prior_run_id,
-            "prior_stage": prior_stage,
-            "prior_job_id": prior_job_id,
-            "prior_manifest": {
-                "job_id": prior_manifest.get("job_id"),
-                "run_id": prior_manifest.get("run_id"),
-                "job_type": prior_manifest.get("job_type"),
-                "inputs_hash": prior_manifest.get("inputs_hash"),
-            },
-            "required_outputs": required_outputs,
-            "prior_output_hashes": prior_output_hashes,  # BLOCKER 2 FIX: Add actual file hashes
-        }
-        prior_artifact_snapshot_bytes = json.dumps(
-            prior_artifact_snapshot, sort_keys=True, ensure_ascii=False
-        ).encode("utf-8")
-        prior_artifact_snapshot_hash = sha256_bytes(prior_artifact_snapshot_bytes)
-        write_json(temp_dir / "inputs" / "prior_artifact.resolved.json", prior_artifact_snapshot)
-        
-        # Phase 1.0 INVARIANT: Compute inputs_hash from ALL snapshot hashes
-        # This creates the chain determinism property:
-        # - Same prior_run_id + same new inputs → same inputs_hash → same run_id
-        snapshot_hashes = {
-            "brief": brief_snapshot_hash,
-            "context": context_snapshot_hash,
-            "model_config": model_snapshot_hash,
-            "doctrine": doctrine_snapshot_hash,
-            "prior_artifact": prior_artifact_snapshot_hash,  # CRITICAL: Chains are deterministic
-        }
-        inputs_hash = compute_inputs_hash(snapshot_hashes)
-        
-        # Phase 1.0 INVARIANT: Derive deterministic run_id from inputs_hash
-        base_run_id = derive_run_id(inputs_hash)
-        
-        # Phase 1.0 COLLISION SEMANTICS: Idempotent replay with deterministic suffix
-        job_root = repo_root / "artifacts" / brief.job_id
-        runs_root = job_root
-        legacy_runs_root = Path(repo_root) / "artifacts" / "runs"
-        ensure_dir(runs_root)
-        ensure_dir(legacy_runs_root)
-        run_id = None
-        final_run_dir = None
-        symlink_actions: List[str] = []
-        
-        def _load_existing_manifest(run_dir: Path) -> RunManifest:
-            with (run_dir / "manifest.json").open("r", encoding="utf-8") as f:
-                return RunManifest.model_validate(json.load(f))
-
-        # Check base run_id first for idempotent replay
-        base_run_dir = runs_root / base_run_id
-        if base_run_dir.exists() and (base_run_dir / "manifest.json").exists():
-            existing_inputs_hash = _read_manifest_inputs_hash(base_run_dir)
-            if existing_inputs_hash == inputs_hash:
-                elapsed = time.monotonic() - started_monotonic
-                print(
-                    f"[run_header] job_id={brief.job_id} job_ref={job_ref} "
-                    f"inputs_hash={inputs_hash} run_id={base_run_id} queue_job_id={queue_job_id} "
-                    f"doctrine={doctrine_version}/{doctrine_content_hash}"
-                )
-                print(
-                    f"[run_footer] status=idempotent_replay artifact_dir={base_run_dir} elapsed_s={elapsed:.3f} "
-                    f"actions=none"
-                )
-                return _load_existing_manifest(base_run_dir)
-
-        # Deterministic suffix scan for collisions with different inputs
-        run_id = base_run_id
-        final_run_dir = runs_root / base_run_id
-        if final_run_dir.exists() and (final_run_dir / "manifest.json").exists():
-            suffix = 2
-            while True:
-                candidate_run_id = f"{base_run_id}-{suffix}"
-                candidate_dir = runs_root / candidate_run_id
-                if not candidate_dir.exists() or not (candidate_dir / "manifest.json").exists():
-                    run_id = candidate_run_id
-                    final_run_dir = candidate_dir
-                    break
+    # Snapshots are serialized in memory (or referenced by source path) and
+    # written once, directly into the final run directory. manifest.json is
+    # the completion marker, so no temp-dir staging is needed.
+    snapshot_buffers: Dict[str, bytes] = {}
+    snapshot_sources: Dict[str, Path] = {}
+    
+    # Phase 1.0 INVARIANT: Load and snapshot all canonical inputs
+
+    # 1. Brief snapshot
+    brief_snapshot_hash, brief_snapshot_size = _sha256_file(job_brief_path)
+    snapshot_buffers["brief.resolved.json"] = json_bytes(brief.model_dump())
+
+    # 2. Context snapshot (load from context.resolved.json if exists)
+    context_snapshot_hash = None
+    context_snapshot_size = 0
+    context_path = prior_artifact_dir / "inputs" / "context.resolved.json"
+    if context_path.exists():
+        context_snapshot_hash, context_snapshot_size = _sha256_file(context_path)
+        snapshot_sources["context.resolved.json"] = context_path
+    else:
+        # If no context in prior, create empty
+        context_snapshot_bytes = b"{}"
+        context_snapshot_hash = sha256_bytes(context_snapshot_bytes)
+        context_snapshot_size = len(context_snapshot_bytes)
+        snapshot_buffers["context.resolved.json"] = context_snapshot_bytes
+
+    # 3. Model config snapshot (constant; file holds exactly the hashed bytes)
+    model_snapshot_bytes = _MODEL_CONFIG_BYTES
+    model_snapshot_hash = _MODEL_CONFIG_HASH
+    snapshot_buffers["model_config.json"] = model_snapshot_bytes
+
+    # 4. Doctrine (load from prior or create new)
+    # Phase 1.0: Even if stage doesn't use doctrine, snapshot it for consistency
+    # and to ensure any future doctrine dependency is captured deterministically
+    doctrine_id = _DOCTRINE_ID
+    doctrine_version = _DOCTRINE_VERSION
+    doctrine_content_hash = _DOCTRINE_CONTENT_HASH
+
+    # Write doctrine snapshot with deterministic structure
+    doctrine_resolved = {
+        "doctrine_id": doctrine_id,
+        "version": doctrine_version,
+        "sha256": doctrine_content_hash,
+    }
+    doctrine_snapshot_bytes = json_bytes(doctrine_resolved)
+    doctrine_snapshot_hash = sha256_bytes(doctrine_snapshot_bytes)
+    snapshot_buffers["doctrine.resolved.json"] = doctrine_snapshot_bytes
 
-                candidate_inputs_hash = _read_manifest_inputs_hash(candidate_dir)
-                if candidate_inputs_hash == inputs_hash:
-                    elapsed = time.monotonic() - started_monotonic
-                    print(
-                        f"[run_header] job_id={brief.job_id} job_ref={job_ref} "
-                        f"inputs_hash={inputs_hash} run_id={candidate_run_id} queue_job_id={queue_job_id} "
-                        f"doctrine={doctrine_version}/{doctrine_content_hash}"
-                    )
-                    print(
-                        f"[run_footer] status=idempotent_replay artifact_dir={candidate_dir} elapsed_s={elapsed:.3f} "
-                        f"actions=none"
-                    )
-                    return _load_existing_manifest(candidate_dir)
-                suffix += 1
-        
-        # Ensure legacy symlink to canonical location
-        symlink_action = _ensure_legacy_symlink(run_id, final_run_dir)
-        
-        # Print run header
+    # 5. PHASE 8 CRITICAL: Prior artifact snapshot (participates in inputs_hash)
+    # This ensures: prior_run_id change → inputs_hash change → run_id change
+    # BLOCKER 2 FIX: Include sha256 of actual prior output files (no silent drift)
+    # Leaf hashes may opt into blake3 (SIGILZERO_HASH_ALGO); the snapshot that
+    # combines them is still hashed with SHA-256, as is inputs_hash.
+    # Files are hashed concurrently (hashlib releases the GIL); dict order
+    # follows required_outputs so the snapshot stays deterministic.
+    leaf_hash_algo = get_leaf_hash_algo()
+    output_paths = [prior_artifact_dir / "outputs" / f for f in required_outputs]
+    for output_path in output_paths:
+        if not output_path.exists():
+            raise ValueError(f"Required output missing: {output_path}")
+
+    def _hash_output(output_path: Path) -> str:
+        return cached_hash_file(output_path, leaf_hash_algo)[0]
+
+    if len(output_paths) <= 1:
+        output_digests = [_hash_output(p) for p in output_paths]
+    else:
+        with ThreadPoolExecutor(max_workers=min(8, len(output_paths))) as pool:
+            output_digests = list(pool.map(_hash_output, output_paths))
+    prior_output_hashes = dict(zip(required_outputs, output_digests))
+
+    prior_artifact_snapshot = {
+        "prior_run_id": prior_run_id,
+        "prior_stage": prior_stage,
+        "prior_job_id": prior_job_id,
+        "prior_manifest": {
+            "job_id": prior_manifest.get("job_id"),
+            "run_id": prior_manifest.get("run_id"),
+            "job_type": prior_manifest.get("job_type"),
+            "inputs_hash": prior_manifest.get("inputs_hash"),
+        },
+        "required_outputs": required_outputs,
+        "prior_output_hashes": prior_output_hashes,  # BLOCKER 2 FIX: Add actual file hashes
+    }
+    # The hash is taken over the exact bytes written to
+    # prior_artifact.resolved.json, so SnapshotValidator can re-verify it from
+    # disk; do not derive it from the fields independently of the file.
+    # Hashed bytes stay on stdlib json: orjson's compact separators would
+    # change this hash and therefore every existing chained run_id.
+    prior_artifact_snapshot_bytes = _PRIOR_ARTIFACT_ENCODER.encode(prior_artifact_snapshot).encode("utf-8")
+    prior_artifact_snapshot_hash = sha256_bytes(prior_artifact_snapshot_bytes)
+    snapshot_buffers["prior_artifact.resolved.json"] = prior_artifact_snapshot_bytes
+
+    # Phase 1.0 INVARIANT: Compute inputs_hash from ALL snapshot hashes
+    # This creates the chain determinism property:
+    # - Same prior_run_id + same new inputs → same inputs_hash → same run_id
+    snapshot_hashes = {
+        "brief": brief_snapshot_hash,
+        "context": context_snapshot_hash,
+        "model_config": model_snapshot_hash,
+        "doctrine": doctrine_snapshot_hash,
+        "prior_artifact": prior_artifact_snapshot_hash,  # CRITICAL: Chains are deterministic
+    }
+    inputs_hash = compute_inputs_hash(snapshot_hashes)
+
+    # Phase 1.0 INVARIANT: Derive deterministic run_id from inputs_hash
+    base_run_id = derive_run_id(inputs_hash)
+
+    # Phase 1.0 COLLISION SEMANTICS: Idempotent replay with deterministic suffix
+    job_root = repo_root / "artifacts" / brief.job_id
+    runs_root = job_root
+    run_id = None
+    final_run_dir = None
+    symlink_actions: List[str] = []
+
+    def _finish_replay(replay_run_id: str, run_dir: Path) -> RunManifest:
+        """Return the stored manifest for an idempotent replay.
+
+        Nothing under run_dir is rewritten; only the legacy alias is restored
+        if it was removed externally (a single lstat when it is present).
+        """
+        replay_actions = []
+        if not os.path.lexists(_LEGACY_RUNS_ROOT / replay_run_id):
+            replay_actions.append(_ensure_legacy_symlink(replay_run_id, run_dir))
+        elapsed = time.monotonic() - started_monotonic
         print(
             f"[run_header] job_id={brief.job_id} job_ref={job_ref} "
-            f"inputs_hash={inputs_hash} run_id={run_id} queue_job_id={queue_job_id} "
+            f"inputs_hash={inputs_hash} run_id={replay_run_id} queue_job_id={queue_job_id} "
             f"doctrine={doctrine_version}/{doctrine_content_hash}"
         )
-        
-        # If this is a fresh run, process outputs
-        status = "succeeded"
-        actions = [symlink_action]
-
-        ensure_dir(final_run_dir / "inputs")
-        ensure_dir(final_run_dir / "outputs")
-
-        # Phase 8 INVARIANT: Copy all snapshots to final location (atomic finalization)
-        snapshot_files = [
-            "brief.resolved.json",
-            "context.resolved.json",
-            "model_config.json",
-            "doctrine.resolved.json",
-            "prior_artifact.resolved.json",
-        ]
-        for filename in snapshot_files:
-            src = temp_dir / "inputs" / filename
-            dst = final_run_dir / "inputs" / filename
-            if src.exists():
-                dst.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(src, dst)
-            else:
-                raise RuntimeError(f"Expected snapshot not found: {src}")
-
-        # Generate optimized output (placeholder)
-        optimization_output = {
-            "job_id": brief.job_id,
-            "prior_run_id": prior_run_id,
-            "status": "optimization_complete",
-            "recommendations": [
-                "Increase brand consistency in messaging",
-                "Enhance emotional resonance while maintaining tone",
-            ],
-        }
-        write_json(final_run_dir / "outputs" / "optimization.json", optimization_output)
-        
-        # Create input snapshots metadata
-        input_snapshots = {
-            "brief": InputSnapshot(
-                path="inputs/brief.resolved.json",
-                sha256=brief_snapshot_hash,
-                bytes=len(brief_snapshot_bytes),
-            ),
-            "context": InputSnapshot(
-                path="inputs/context.resolved.json",
-                sha256=context_snapshot_hash,
-                bytes=len(context_snapshot_bytes),
-            ),
-            "model_config": InputSnapshot(
-                path="inputs/model_config.json",
-                sha256=model_snapshot_hash,
-                bytes=len(model_snapshot_bytes),
-            ),
-            "doctrine": InputSnapshot(
-                path="inputs/doctrine.resolved.json",
-                sha256=doctrine_snapshot_hash,
-                bytes=len(doctrine_snapshot_bytes),
-            ),
-            "prior_artifact": InputSnapshot(
-                path="inputs/prior_artifact.resolved.json",
-                sha256=prior_artifact_snapshot_hash,
-                bytes=len(prior_artifact_snapshot_bytes),
-            ),
-        }
-        
-        # Build manifest
-        manifest = RunManifest(
-            job_id=brief.job_id,
-            run_id=run_id,
-            queue_job_id=queue_job_id,
-            job_ref=job_ref,
-            job_type="brand_optimization",
-            started_at=_utc_now(),
-            status=status,
-            inputs_hash=inputs_hash,
-            input_snapshots={k: v.model_dump() for k, v in input_snapshots.items()},
-            doctrine=DoctrineReference(
-                doctrine_id=doctrine_id,
-                version=doctrine_version,
-                sha256=doctrine_content_hash,
-            ).model_dump(exclude_unset=True),
-            artifacts={
-                "optimization": {
-                    "path": "outputs/optimization.json",
-                    "sha256": sha256_bytes((final_run_dir / "outputs" / "optimization.json").read_bytes()),
-                }
-            },
-            chain_metadata=ChainMetadata(
-                is_chainable_stage=True,
-                prior_stages=[
-                    ChainedStage(
-                        run_id=prior_run_id,
-                        job_id=prior_job_id,
-                        stage=prior_stage,
-                        output_references=[f"artifacts/{prior_job_id}/{prior_run_id}/outputs/{f}" for f in required_outputs],
-                    )
-                ],
-            ).model_dump(),
-        )
-        
-        manifest.finished_at = _utc_now()
-        
-        # Write manifest
-        manifest_path = final_run_dir / "manifest.json"
-        write_json(manifest_path, manifest.model_dump(by_alias=False))
-        
-        elapsed = time.monotonic() - started_monotonic
         print(
-            f"[run_footer] status={status} artifact_dir={final_run_dir} elapsed_s={elapsed:.3f} "
-            f"actions={','.join(actions) or 'none'}"
+            f"[run_footer] status=idempotent_replay artifact_dir={run_dir} elapsed_s={elapsed:.3f} "
+            f"actions={','.join(replay_actions) or 'none'}"
         )
-        
-        return manifest
-        
-    finally:
-        # Cleanup temp directory
-        if temp_dir.exists():
-            shutil.rmtree(temp_dir, ignore_errors=True)
+        return RunManifest.model_validate(orjson.loads((run_dir / "manifest.json").read_bytes()))
+
+    # Check base run_id first for idempotent replay. Candidates are exact
+    # names, so each probe is a single stat of <run_dir>/manifest.json rather
+    # than a listing of the job directory.
+    base_run_dir = runs_root / base_run_id
+    base_run_taken = (base_run_dir / "manifest.json").exists()
+    if base_run_taken:
+        existing_inputs_hash = _read_manifest_inputs_hash(base_run_dir)
+        if existing_inputs_hash == inputs_hash:
+            return _finish_replay(base_run_id, base_run_dir)
+
+    # Deterministic suffix scan for collisions with different inputs
+    run_id = base_run_id
+    final_run_dir = base_run_dir
+    if base_run_taken:
+        suffix = 2
+        while True:
+            candidate_run_id = f"{base_run_id}-{suffix}"
+            candidate_dir = runs_root / candidate_run_id
+            if not (candidate_dir / "manifest.json").exists():
+                run_id = candidate_run_id
+                final_run_dir = candidate_dir
+                break
+
+            candidate_inputs_hash = _read_manifest_inputs_hash(candidate_dir)
+            if candidate_inputs_hash == inputs_hash:
+                return _finish_replay(candidate_run_id, candidate_dir)
+            suffix += 1
+
+    # Ensure legacy symlink to canonical location
+    symlink_action = _ensure_legacy_symlink(run_id, final_run_dir)
+
+    # Print run header
+    print(
+        f"[run_header] job_id={brief.job_id} job_ref={job_ref} "
+        f"inputs_hash={inputs_hash} run_id={run_id} queue_job_id={queue_job_id} "
+        f"doctrine={doctrine_version}/{doctrine_content_hash}"
+    )
+
+    # If this is a fresh run, process outputs
+    status = "succeeded"
+    actions = [symlink_action]
+
+    # Create the run layout once up front (inputs/ creates the run dir itself)
+    inputs_dir = final_run_dir / "inputs"
+    outputs_dir = final_run_dir / "outputs"
+    inputs_dir.mkdir(parents=True, exist_ok=True)
+    outputs_dir.mkdir(exist_ok=True)
+
+    # Phase 8 INVARIANT: Write all snapshots to final location (each via tmp + rename)
+    snapshot_files = [
+        "brief.resolved.json",
+        "context.resolved.json",
+        "model_config.json",
+        "doctrine.resolved.json",
+        "prior_artifact.resolved.json",
+    ]
+    for filename in snapshot_files:
+        dst = inputs_dir / filename
+        tmp_dst = dst.with_name(filename + ".tmp")
+        if filename in snapshot_buffers:
+            tmp_dst.write_bytes(snapshot_buffers[filename])
+        elif filename in snapshot_sources:
+            fast_copy(snapshot_sources[filename], tmp_dst)
+        else:
+            raise RuntimeError(f"Expected snapshot not found: {filename}")
+        os.replace(tmp_dst, dst)
+
+    # Generate optimized output (placeholder)
+    optimization_output = {
+        "job_id": brief.job_id,
+        "prior_run_id": prior_run_id,
+        "status": "optimization_complete",
+        "recommendations": [
+            "Increase brand consistency in messaging",
+            "Enhance emotional resonance while maintaining tone",
+        ],
+    }
+    # Serialize once: the same buffer is written and hashed for the manifest
+    optimization_bytes = json_bytes(optimization_output)
+    (outputs_dir / "optimization.json").write_bytes(optimization_bytes)
+    optimization_hash = sha256_bytes(optimization_bytes)
+
+    # Create input snapshots metadata: (name, path, sha256, bytes) records,
+    # passed as plain dicts so RunManifest validates them in a single pass
+    snapshot_records = (
+        ("brief", "inputs/brief.resolved.json", brief_snapshot_hash, brief_snapshot_size),
+        ("context", "inputs/context.resolved.json", context_snapshot_hash, context_snapshot_size),
+        ("model_config", "inputs/model_config.json", model_snapshot_hash, len(model_snapshot_bytes)),
+        ("doctrine", "inputs/doctrine.resolved.json", doctrine_snapshot_hash, len(doctrine_snapshot_bytes)),
+        (
+            "prior_artifact",
+            "inputs/prior_artifact.resolved.json",
+            prior_artifact_snapshot_hash,
+            len(prior_artifact_snapshot_bytes),
+        ),
+    )
+    input_snapshots = {
+        name: {"path": path, "sha256": sha256, "bytes": size}
+        for name, path, sha256, size in snapshot_records
+    }
+
+    # Build manifest
+    manifest = RunManifest(
+        job_id=brief.job_id,
+        run_id=run_id,
+        queue_job_id=queue_job_id,
+        job_ref=job_ref,
+        job_type="brand_optimization",
+        started_at=_utc_now(started_wall),
+        status=status,
+        inputs_hash=inputs_hash,
+        input_snapshots=input_snapshots,
+        doctrine=DoctrineReference(
+            doctrine_id=doctrine_id,
+            version=doctrine_version,
+            sha256=doctrine_content_hash,
+        ),
+        artifacts={
+            "optimization": {
+                "path": "outputs/optimization.json",
+                "sha256": optimization_hash,
+            }
+        },
+        chain_metadata=ChainMetadata(
+            is_chainable_stage=True,
+            prior_stages=[
+                ChainedStage(
+                    run_id=prior_run_id,
+                    job_id=prior_job_id,
+                    stage=prior_stage,
+                    output_references=[f"artifacts/{prior_job_id}/{prior_run_id}/outputs/{f}" for f in required_outputs],
+                )
+            ],
+        ),
+    )
+
+    # finished_at is offset from started_at by the monotonic elapsed time, so
+    # the pair is consistent even if the wall clock steps mid-run
+    manifest.finished_at = _utc_now(started_wall + (time.monotonic() - started_monotonic))
+
+    # Write manifest
+    manifest_path = final_run_dir / "manifest.json"
+    manifest_path.write_bytes(manifest_bytes(manifest))
+    index_run(artifacts_root, brief.job_id, run_id)
+
+    elapsed = time.monotonic() - started_monotonic
+    print(
+        f"[run_footer] status={status} artifact_dir={final_run_dir} elapsed_s={elapsed:.3f} "
+        f"actions={','.join(actions) or 'none'}"
+    )
+
+    return manifest
 
 
 if __name__ == "__main__":
@@ -1,23 +1,34 @@
 from __future__ import annotations
 
-import json
+import fnmatch
+import hashlib
 import os
+import re
 import shutil
+import struct
 import time
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Tuple
 
+import orjson
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml-backed
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _YamlLoader  # type: ignore
+
 from sigilzero.core.doctrine import get_doctrine_loader
-from sigilzero.core.fs import ensure_dir, write_text, write_json
-from sigilzero.core.hashing import sha256_bytes, sha256_json, compute_inputs_hash, derive_run_id
-from sigilzero.core.langfuse_client import get_langfuse
+from sigilzero.core.fs import ensure_dir, ensure_run_dirs, manifest_bytes, new_temp_id, write_and_hash_json, write_bytes, write_bytes_atomic
+from sigilzero.core.hashing import sha256_bytes, sha256_json, hash_dict, compute_inputs_hash, derive_run_id
+from sigilzero.core.langfuse_client import get_langfuse, lf_span
 from sigilzero.core.model import generate_text
 from sigilzero.core.prompting import load_prompt_template
 from sigilzero.core.retrieval import retrieve_corpus_documents
+from sigilzero.core.run_index import index_run
 from sigilzero.core.schemas import (
     BriefSpec,
     ContextSpec,
@@ -39,8 +50,116 @@ def _utc_now() -> str:
 
 
 def _read_yaml(path: Path) -> Dict[str, Any]:
-    with path.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    """Read YAML file, return dict."""
+    return yaml.load(path.read_bytes(), Loader=_YamlLoader) or {}
+
+
+def _legacy_alias_enabled() -> bool:
+    """Whether to maintain artifacts/runs/<run_id> aliases (SIGILZERO_LEGACY_ALIAS, default off)."""
+    return os.getenv("SIGILZERO_LEGACY_ALIAS", "0") == "1"
+
+
+def _render_brief_block(brief: BriefSpec) -> str:
+    """Render the brief section of the instagram_copy prompt."""
+    return (
+        f"Brand: {brief.brand}\n"
+        f"Artist: {brief.artist or 'N/A'}\n"
+        f"Title: {brief.title or 'N/A'}\n"
+        f"Tone: {', '.join(brief.tone_tags)}\n"
+        f"\n"
+        f"IG Settings:\n"
+        f"Captions needed: {brief.ig.caption_count}\n"
+        f"Hashtags needed: {brief.ig.hashtag_count}\n"
+        f"Max chars: {brief.ig.max_caption_chars}\n"
+        f"Include CTA: {brief.ig.include_cta}\n"
+        f"Include Emojis: {brief.ig.include_emojis}"
+    )
+
+
+def _render_md(header_lines: List[str], captions: List[Dict[str, Any]]) -> bytes:
+    """Render a captions markdown file: header lines, then one section per caption.
+
+    Returns the UTF-8 bytes that are written and hashed.
+    """
+    parts = header_lines + [
+        part
+        for i, cap_dict in enumerate(captions, 1)
+        for part in (f"## Caption {i}", cap_dict["caption"].strip(), "")
+    ]
+    return ("\n".join(parts).strip() + "\n").encode("utf-8")
+
+
+def _emit_artifact(run_dir: Path, rel_path: str, data: str | bytes) -> Dict[str, Any]:
+    """Write an output artifact and return its manifest entry.
+
+    Text is encoded to UTF-8 once; the same bytes are written, hashed and
+    measured.
+    """
+    payload = data.encode("utf-8") if isinstance(data, str) else data
+    write_bytes(run_dir / rel_path, payload)
+    return {"sha256": sha256_bytes(payload), "bytes": len(payload)}
+
+
+def _read_manifest_inputs_hash(dir_path: Path) -> str | None:
+    """Read inputs_hash from manifest.json, return None if not found/invalid."""
+    try:
+        return orjson.loads((dir_path / "manifest.json").read_bytes()).get("inputs_hash")
+    except Exception:
+        return None
+
+
+# A caption separator: a line whose first non-whitespace characters are "---"
+def _parse_captions(raw: str) -> List[IGCaption]:
+    """Split raw model output into captions on "---" separator lines.
+
+    A "---" line only separates when at least one line precedes it in the
+    current caption; otherwise it is kept as caption text. Separators are
+    located with str.find over the joined text, so only lines containing
+    "---" are examined in Python.
+    """
+    text = "\n".join([ln.rstrip() for ln in raw.splitlines()])
+    captions: List[IGCaption] = []
+    start = 0
+    pos = text.find("---")
+    while pos != -1:
+        line_start = text.rfind("\n", 0, pos) + 1
+        line_end = text.find("\n", pos)
+        if line_end == -1:
+            line_end = len(text)
+        # Separator: "---" is the first non-whitespace on its line
+        if line_start > start and (line_start == pos or text[line_start:pos].isspace()):
+            cap = text[start:line_start].strip()
+            if cap:
+                captions.append(IGCaption(caption=cap, hashtags=[]))
+            start = line_end + 1
+        pos = text.find("---", line_end)
+    cap = text[start:].strip()
+    if cap:
+        captions.append(IGCaption(caption=cap, hashtags=[]))
+    return captions
+
+
+def _scan_run_entries(root: Path, base_run_id: str) -> Dict[str, os.DirEntry]:
+    """Entries under root that are base_run_id or a base_run_id-<suffix> collision.
+
+    One readdir gives existence and type (d_type) for every candidate, so
+    collision checks need no per-path stat calls.
+    """
+    prefix = f"{base_run_id}-"
+    try:
+        with os.scandir(root) as entries:
+            return {e.name: e for e in entries if e.name == base_run_id or e.name.startswith(prefix)}
+    except FileNotFoundError:
+        return {}
+
+
+def _entry_exists(entry: os.DirEntry | None) -> bool:
+    """Path.exists() for a scanned entry: only symlinks need a stat (to follow them)."""
+    if entry is None:
+        return False
+    if entry.is_symlink():
+        return os.path.exists(entry.path)
+    return True
 
 
 def _resolve_repo_path(repo_root: str, rel_path: str) -> Path:
@@ -64,34 +183,385 @@ def _resolve_repo_path(repo_root: str, rel_path: str) -> Path:
     return p
 
 
-def _materialize_context(repo_root: str, spec: ContextSpec) -> Tuple[str, str]:
-    """Return (context_content, context_content_hash)."""
-    chunks: List[str] = []
+def _context_hash_v2_enabled() -> bool:
+    """Whether context_content_hash uses the per-file Merkle scheme (SIGILZERO_CONTEXT_HASH_V2)."""
+    return os.getenv("SIGILZERO_CONTEXT_HASH_V2", "0") == "1"
+
+
+def _read_context_file(fp: Path, with_hash: bool = False) -> Tuple[bytes, str | None]:
+    """Read a context file as UTF-8 bytes of Path.read_text(errors="replace").
+
+    Clean files (ASCII, or valid UTF-8, without "\r") are already in that
+    form and are returned as read. Anything else is decoded with replacement
+    and the same universal-newline translation text mode applies, then
+    re-encoded, so materialized content (and its hash) is unchanged.
+    Returns (content bytes, sha256 of the raw file bytes if with_hash else None).
+    """
+    with open(fp, "rb") as f:
+        data = f.read()
+    file_hash = sha256_bytes(data) if with_hash else None
+    if b"\r" not in data:
+        if data.isascii():
+            return data, file_hash
+        try:
+            data.decode("utf-8")
+            return data, file_hash
+        except UnicodeDecodeError:
+            pass
+    txt = data.decode("utf-8", errors="replace")
+    if "\r" in txt:
+        txt = txt.replace("\r\n", "\n").replace("\r", "\n")
+    return txt.encode("utf-8"), file_hash
+
+
+# ASCII characters for which str.isspace() is true
+_ASCII_WHITESPACE = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+
+def _rstrip_utf8(data: bytes) -> bytes:
+    """bytes equivalent of data.decode("utf-8").rstrip().encode("utf-8")."""
+    stripped = data.rstrip(_ASCII_WHITESPACE)
+    if stripped and stripped[-1] >= 0x80:
+        # May end in non-ASCII whitespace (e.g. U+00A0); defer to str.rstrip
+        return stripped.decode("utf-8").rstrip().encode("utf-8")
+    return stripped
+
+
+_GlobParts = Tuple[Any, ...]  # "**" or a compiled fnmatch regex per segment
+
+
+@lru_cache(maxsize=256)
+def _compile_glob(pattern: str) -> _GlobParts | None:
+    """Compile a relative glob into per-segment matchers, or None if unsupported.
+
+    Patterns the walk-based matcher does not model (absolute, "." / ".."
+    segments, empty segments) return None and fall back to Path.glob.
+    """
+    segments = pattern.split("/")
+    if not pattern or any(seg in ("", ".", "..") for seg in segments):
+        return None
+    return tuple(seg if seg == "**" else re.compile(fnmatch.translate(seg)) for seg in segments)
+
+
+def _glob_regex_source(pattern: str) -> str:
+    """Full-path regex source for a glob, a superset of its _glob_match matches.
+
+    "**" becomes zero or more directory prefixes; other segments reuse
+    fnmatch.translate (whose "*" may also cross "/", hence superset).
+    """
+    segments = pattern.split("/")
+    pieces: List[str] = []
+    for i, seg in enumerate(segments):
+        last = i == len(segments) - 1
+        if seg == "**":
+            # Trailing "**" only yields directories, never files
+            pieces.append("(?!)" if last else "(?:[^/]+/)*")
+            continue
+        translated = fnmatch.translate(seg)
+        # "(?s:...)\Z" on supported Pythons; anything else degrades to "any"
+        translated = translated[:-2] if translated.endswith("\\Z") else "(?s:.*)"
+        pieces.append(translated if last else translated + "/")
+    return "".join(pieces)
+
+
+@lru_cache(maxsize=256)
+def _compile_glob_union(patterns: Tuple[str, ...]) -> re.Pattern:
+    """Compile globs (all supported by _compile_glob) into one alternation prefilter."""
+    if not patterns:
+        return re.compile("(?!)")
+    return re.compile("|".join(f"(?:{_glob_regex_source(pat)})" for pat in patterns))
+
+
+def _literal_prefix(pattern: str) -> Tuple[str, ...]:
+    """Leading directory segments of a glob that contain no wildcards."""
+    prefix: List[str] = []
+    for seg in pattern.split("/")[:-1]:
+        if any(ch in seg for ch in "*?["):
+            break
+        prefix.append(seg)
+    return tuple(prefix)
+
+
+def _walk_bases(patterns: List[str]) -> List[Tuple[str, ...]]:
+    """Minimal set of literal prefixes covering every pattern (ancestors absorb descendants)."""
+    bases: List[Tuple[str, ...]] = []
+    for prefix in sorted({_literal_prefix(pat) for pat in patterns}):
+        # Sorted order puts an ancestor right before all of its descendants
+        if not bases or prefix[: len(bases[-1])] != bases[-1]:
+            bases.append(prefix)
+    return bases
+
+
+def _walk_files(
+    root: Path, max_symlink_hops: int, prefix: Tuple[str, ...] = ()
+) -> Tuple[List[Tuple[str, ...]], set]:
+    """List files under root/prefix once, as part tuples relative to root.
+
+    Returns (file part tuples, set of part tuples of symlinked directories).
+    Symlinked directories are followed (Path.glob follows them for literal and
+    wildcard segments), at most max_symlink_hops per path so cycles terminate;
+    symlinks within prefix count towards that bound.
+    """
+    files: List[Tuple[str, ...]] = []
+    symlink_dirs: set = set()
+    hops = 0
+    for k in range(1, len(prefix) + 1):
+        if root.joinpath(*prefix[:k]).is_symlink():
+            symlink_dirs.add(prefix[:k])
+            hops += 1
+    start = root.joinpath(*prefix)
+    if not start.is_dir():
+        return files, symlink_dirs
+    stack: List[Tuple[str, Tuple[str, ...], int]] = [(str(start), prefix, hops)]
+    while stack:
+        dir_path, rel, hops = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            parts = rel + (entry.name,)
+            try:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        stack.append((entry.path, parts, hops))
+                    elif hops < max_symlink_hops:
+                        symlink_dirs.add(parts)
+                        stack.append((entry.path, parts, hops + 1))
+                elif entry.is_file():
+                    files.append(parts)
+            except OSError:
+                continue
+    return files, symlink_dirs
+
+
+def _glob_match(pat: _GlobParts, parts: Tuple[str, ...], symlink_dirs: set, i: int = 0, j: int = 0) -> bool:
+    """Whether file parts[j:] matches pattern segments pat[i:] with Path.glob semantics.
+
+    "**" spans zero or more directories but, like Path.glob, does not descend
+    into symlinked ones.
+    """
+    while i < len(pat):
+        seg = pat[i]
+        if seg == "**":
+            rest = i + 1
+            if rest == len(pat):
+                return False  # trailing "**" only yields directories
+            for k in range(j, len(parts)):
+                if _glob_match(pat, parts, symlink_dirs, rest, k):
+                    return True
+                if parts[: k + 1] in symlink_dirs:
+                    return False
+            return False
+        if j >= len(parts) or not seg.match(parts[j]):
+            return False
+        i += 1
+        j += 1
+    return j == len(parts)
+
+
+_CONTEXT_READ_POOL_MIN_FILES = 4
+_CONTEXT_READ_POOL_MAX_WORKERS = 16
+
+
+def _select_context_files(repo_root: str, spec: ContextSpec) -> List[Path]:
+    """Resolve the spec's selectors to the ordered list of context files."""
+    selected: List[Path] = []
 
     for sel in spec.selectors:
         root = Path(repo_root) / sel.root
         if not root.exists():
             continue
 
-        # gather files
-        matched: List[Path] = []
-        for pat in sel.include_globs:
-            matched.extend(sorted(root.glob(pat)))
+        # List the tree once and match every pattern against the in-memory
+        # listing. Per pattern, results keep sorted(root.glob(pat)) order
+        # (Path sorts by parts), so materialized content is unchanged.
+        include = [_compile_glob(pat) for pat in sel.include_globs]
+        exclude = [_compile_glob(pat) for pat in sel.exclude_globs]
+        if any(compiled is None for compiled in include + exclude):
+            matched: List[Path] = []
+            for pat in sel.include_globs:
+                matched.extend(p for p in sorted(root.glob(pat)) if p.is_file())
+            excluded: set[Path] = set()
+            for pat in sel.exclude_globs:
+                excluded.update(root.glob(pat))
+            files = [p for p in matched if p not in excluded][: sel.max_files]
+            selected.extend(files)
+            continue
 
-        # apply excludes
-        excluded: set[Path] = set()
-        for pat in sel.exclude_globs:
-            excluded.update(set(root.glob(pat)))
+        # A match crosses a symlinked directory only on a non-"**"
+        # segment, so hops are bounded by the longest pattern
+        max_hops = max(
+            (sum(1 for seg in compiled if seg != "**") - 1 for compiled in include + exclude),
+            default=0,
+        )
+        # Only walk below each include pattern's literal leading directories;
+        # excludes just filter what the includes matched
+        listing: List[Tuple[str, ...]] = []
+        symlink_dirs: set = set()
+        for base in _walk_bases(sel.include_globs):
+            base_files, base_links = _walk_files(root, max_hops, base)
+            listing.extend(base_files)
+            symlink_dirs |= base_links
+        listing.sort()
 
-        files = [p for p in matched if p.is_file() and p not in excluded][: sel.max_files]
+        # One alternation regex over all include globs discards most of the
+        # listing in C; exact per-pattern matching (and ordering) only runs
+        # on the survivors.
+        include_any = _compile_glob_union(tuple(sel.include_globs))
+        candidates = [parts for parts in listing if include_any.fullmatch("/".join(parts))]
+        matched_parts: List[Tuple[str, ...]] = []
+        for compiled in include:
+            matched_parts.extend(parts for parts in candidates if _glob_match(compiled, parts, symlink_dirs))
 
-        for fp in files:
-            rel = fp.relative_to(Path(repo_root))
-            txt = fp.read_text(encoding="utf-8", errors="replace")
-            chunks.append(f"\n\n# FILE: {rel.as_posix()}\n{txt}")
+        # Excludes only matter for matched files
+        if exclude:
+            exclude_any = _compile_glob_union(tuple(sel.exclude_globs))
+            matched_parts = [
+                parts for parts in matched_parts
+                if not (
+                    exclude_any.fullmatch("/".join(parts))
+                    and any(_glob_match(compiled, parts, symlink_dirs) for compiled in exclude)
+                )
+            ]
 
-    content = "".join(chunks).strip()
-    content_hash = sha256_bytes(content.encode("utf-8"))
+        files = [root.joinpath(*parts) for parts in matched_parts[: sel.max_files]]
+        selected.extend(files)
+    return selected
+
+
+def _iter_context_reads(selected: List[Path], hash_v2: bool) -> Iterator[Tuple[bytes, str | None]]:
+    """Yield _read_context_file results in selection order.
+
+    Reads are IO-bound and release the GIL, so larger selections are read
+    through a pool; map() keeps selector/file order, which the content hash
+    depends on. Results are yielded as they are consumed, so a caller that
+    does not keep them holds only the reads still in flight.
+    """
+    # Below _CONTEXT_READ_POOL_MIN_FILES the pool setup costs more than it saves.
+    if len(selected) >= _CONTEXT_READ_POOL_MIN_FILES:
+        with ThreadPoolExecutor(max_workers=min(_CONTEXT_READ_POOL_MAX_WORKERS, len(selected))) as pool:
+            yield from pool.map(lambda fp: _read_context_file(fp, hash_v2), selected)
+    else:
+        for fp in selected:
+            yield _read_context_file(fp, hash_v2)
+
+
+def _compose_context(repo_root: str, selected: List[Path]) -> Tuple[str, str]:
+    """Return (context_content, context_content_hash) for selected files.
+
+    Content is composed as UTF-8 bytes, hashing each piece as it is appended,
+    instead of joining, stripping and re-encoding the whole corpus. Every
+    chunk contains "# FILE:", so stripping the joined text equals dropping
+    the first chunk's leading "\n\n" and rstripping the last chunk.
+    """
+    # Under V2, per-file digests are taken in the read workers over the raw bytes.
+    hash_v2 = _context_hash_v2_enabled()
+    h = hashlib.sha256()
+    buf = bytearray()
+    leaves: List[str] = []
+    last = len(selected) - 1
+    root_path = Path(repo_root)
+    for i, (fp, (data, file_hash)) in enumerate(zip(selected, _iter_context_reads(selected, hash_v2))):
+        rel_posix = fp.relative_to(root_path).as_posix()
+        if hash_v2:
+            leaves.append(f"{rel_posix}\t{file_hash}")
+        header = f"# FILE: {rel_posix}\n".encode("utf-8")
+        if i > 0:
+            header = b"\n\n" + header
+        if i == last:
+            pieces: Tuple[bytes, ...] = (_rstrip_utf8(header + data),)
+        else:
+            pieces = (header, data)
+        for piece in pieces:
+            if not hash_v2:
+                h.update(piece)
+            buf += piece
+
+    content = buf.decode("utf-8")
+    if hash_v2:
+        # V2: Merkle-style root over "<path>\t<file sha256>" leaves in selection
+        # order. Leaves depend only on their own file, so they are hashed in
+        # the read workers rather than over the concatenated corpus.
+        # Different values than V1, hence opt-in.
+        return content, sha256_bytes("\n".join(leaves).encode("utf-8"))
+    return content, f"sha256:{h.hexdigest()}"
+
+
+def _context_cache_enabled() -> bool:
+    """Whether materialized context is cached (SIGILZERO_CONTEXT_CACHE, default on)."""
+    return os.getenv("SIGILZERO_CONTEXT_CACHE", "1") != "0"
+
+
+# Files modified this recently are not cached: a same-size rewrite within the
+# filesystem's timestamp granularity would leave the fingerprint unchanged.
+_CONTEXT_CACHE_MIN_AGE_S = 2.0
+
+
+def _context_fingerprint(repo_root: str, spec: ContextSpec, selected: List[Path]) -> Tuple[str, str, bool]:
+    """Return (spec_key, fingerprint, cacheable) for the spec and the stat identity of its files.
+
+    spec_key covers the spec and the hash scheme and names the cache entry,
+    so a changed corpus overwrites the previous entry for the same spec.
+    The fingerprint adds each selected file's (path, mtime_ns, size); per-file
+    stats are used rather than directory mtimes, which do not change when a
+    file is edited in place.
+    """
+    root_path = Path(repo_root)
+    newest = 0
+    files = []
+    for fp in selected:
+        st = os.stat(fp)
+        newest = max(newest, st.st_mtime_ns)
+        files.append([fp.relative_to(root_path).as_posix(), st.st_mtime_ns, st.st_size])
+    spec_key = sha256_json({
+        "spec": spec.model_dump(mode="json"),
+        "hash_v2": _context_hash_v2_enabled(),
+    })
+    fingerprint = sha256_json({"spec_key": spec_key, "files": files})
+    return spec_key, fingerprint, time.time_ns() - newest > _CONTEXT_CACHE_MIN_AGE_S * 1e9
+
+
+def _context_cache_path(repo_root: str, spec_key: str) -> Path:
+    # artifacts/cache/ is excluded from job scans
+    return Path(repo_root) / "artifacts" / "cache" / "context" / f"{spec_key.split(':', 1)[-1]}.json"
+
+
+def _materialize_context(repo_root: str, spec: ContextSpec) -> Tuple[str, str]:
+    """Return (context_content, context_content_hash).
+
+    Reuses a cached result when the spec and every selected file's stat
+    identity match the last materialization for that spec, skipping the file
+    reads. One entry is kept per spec.
+    """
+    selected = _select_context_files(repo_root, spec)
+    cache_path = None
+    if _context_cache_enabled():
+        try:
+            spec_key, fingerprint, cacheable = _context_fingerprint(repo_root, spec, selected)
+        except OSError:
+            spec_key, fingerprint, cacheable = None, None, False
+        if spec_key is not None:
+            cache_path = _context_cache_path(repo_root, spec_key)
+            try:
+                entry = orjson.loads(cache_path.read_bytes())
+                if entry.get("fingerprint") == fingerprint:
+                    return entry["content"], entry["content_hash"]
+            except (OSError, ValueError, KeyError, AttributeError):
+                pass
+            if not cacheable:
+                cache_path = None
+
+    content, content_hash = _compose_context(repo_root, selected)
+    if cache_path is not None:
+        try:
+            write_bytes_atomic(
+                cache_path,
+                orjson.dumps({"fingerprint": fingerprint, "content": content, "content_hash": content_hash}),
+            )
+        except OSError:
+            pass
     return content, content_hash
 
 
@@ -119,13 +589,17 @@ def execute_instagram_copy_pipeline(repo_root: str, job_ref: str, params: Dict[s
     # Phase 1.0: Create temp directory for atomic run creation
     # Canonical layout: artifacts/<job_id>/<run_id>/...
     # Use per-job .tmp/ subdirectory to avoid polluting run listings.
-    job_root = Path(repo_root) / "artifacts" / brief.job_id
+    artifacts_root = Path(repo_root) / "artifacts"
+    job_root = artifacts_root / brief.job_id
     tmp_base = job_root / ".tmp"
     ensure_dir(tmp_base)
-    temp_id = f"tmp-{uuid.uuid4().hex[:16]}"
+    # Finalization is a single rename of temp_dir into job_root, which is only
+    # atomic within one filesystem; fail up front rather than at the end.
+    if os.stat(tmp_base).st_dev != os.stat(job_root).st_dev:
+        raise RuntimeError(f"Staging dir {tmp_base} must be on the same filesystem as {job_root}")
+    temp_id = new_temp_id()
     temp_dir = tmp_base / temp_id
-    ensure_dir(temp_dir / "inputs")
-    ensure_dir(temp_dir / "outputs")
+    ensure_run_dirs(temp_dir)
     
     # Phase 1.0 INVARIANT: Write canonical JSON snapshots FIRST
     # These snapshots are the source of truth for inputs_hash computation
@@ -150,10 +624,13 @@ def execute_instagram_copy_pipeline(repo_root: str, job_ref: str, params: Dict[s
         brief.context_mode == "glob"):
         exclude_fields.update({"context_mode", "context_query", "retrieval_top_k", "retrieval_method"})
     
-    brief_resolved = brief.model_dump(exclude=exclude_fields)
-    write_json(temp_dir / "inputs" / "brief.resolved.json", brief_resolved)
-    brief_snapshot_bytes = (temp_dir / "inputs" / "brief.resolved.json").read_bytes()
-    brief_snapshot_hash = sha256_bytes(brief_snapshot_bytes)
+    # One dump serves both the snapshot and the legacy brief_hash (which only
+    # drops brief_hash/repo_commit); the snapshot filters the extra fields.
+    brief_hash_dict = brief.model_dump(exclude={"brief_hash", "repo_commit"}, warnings=False)
+    brief_resolved = {k: v for k, v in brief_hash_dict.items() if k not in exclude_fields}
+    brief_snapshot_bytes, brief_snapshot_hash = write_and_hash_json(
+        temp_dir / "inputs" / "brief.resolved.json", brief_resolved
+    )
     
     # 2. Context spec and content (Stage 6: supports glob and retrieve modes)
     if brief.context_mode == "retrieve":
@@ -203,14 +680,16 @@ def execute_instagram_copy_pipeline(repo_root: str, job_ref: str, params: Dict[s
         context_content, context_content_hash = _materialize_context(repo_root, context_spec)
     
     # Write context snapshot
+    # Also the input to context_spec_hash below (same dump, hashed once more)
+    context_spec_dict = context_spec.model_dump(exclude={"context_spec_hash"}, warnings=False)
     context_resolved = {
-        "spec": context_spec.model_dump(exclude={"context_spec_hash"}),
+        "spec": context_spec_dict,
         "content": context_content,
         "content_hash": context_content_hash,
     }
-    write_json(temp_dir / "inputs" / "context.resolved.json", context_resolved)
-    context_snapshot_bytes = (temp_dir / "inputs" / "context.resolved.json").read_bytes()
-    context_snapshot_hash = sha256_bytes(context_snapshot_bytes)
+    context_snapshot_bytes, context_snapshot_hash = write_and_hash_json(
+        temp_dir / "inputs" / "context.resolved.json", context_resolved
+    )
     
     # 3. Model configuration
     model_config = {
@@ -222,14 +701,16 @@ def execute_instagram_copy_pipeline(repo_root: str, job_ref: str, params: Dict[s
         "response_schema_version": "v1.0.0",
         "cache_enabled": True,
     }
-    write_json(temp_dir / "inputs" / "model_config.json", model_config)
-    model_snapshot_bytes = (temp_dir / "inputs" / "model_config.json").read_bytes()
-    model_snapshot_hash = sha256_bytes(model_snapshot_bytes)
+    model_snapshot_bytes, model_snapshot_hash = write_and_hash_json(
+        temp_dir / "inputs" / "model_config.json", model_config
+    )
     
     # 4. Doctrine (prompt template) - Phase 1.0 governance requirement
     doctrine_loader = get_doctrine_loader(repo_root)
     template_id = "prompts/instagram_copy"
-    template_version = "v1.0.0"
+    # v1.1.0 places context_items before the brief so the prompt prefix stays
+    # stable across jobs (v1.0.0 remains for replaying older runs)
+    template_version = "v1.1.0"
     prompt_template, doctrine_ref = doctrine_loader.load_doctrine(
         doctrine_id=template_id,
         version=template_version,
@@ -243,9 +724,9 @@ def execute_instagram_copy_pipeline(repo_root: str, job_ref: str, params: Dict[s
         "content": prompt_template,
         "sha256": doctrine_ref.sha256,
     }
-    write_json(temp_dir / "inputs" / "doctrine.resolved.json", doctrine_resolved)
-    doctrine_snapshot_bytes = (temp_dir / "inputs" / "doctrine.resolved.json").read_bytes()
-    doctrine_snapshot_hash = sha256_bytes(doctrine_snapshot_bytes)
+    doctrine_snapshot_bytes, doctrine_snapshot_hash = write_and_hash_json(
+        temp_dir / "inputs" / "doctrine.resolved.json", doctrine_resolved
+    )
     
     # Phase 1.0 INVARIANT: Compute inputs_hash from snapshot hashes
     snapshot_hashes = {
@@ -278,38 +759,36 @@ def execute_instagram_copy_pipeline(repo_root: str, job_ref: str, params: Dict[s
     
     runs_root = job_root
     legacy_runs_root = Path(repo_root) / "artifacts" / "runs"
+    legacy_alias_enabled = _legacy_alias_enabled()
     ensure_dir(runs_root)
-    ensure_dir(legacy_runs_root)
+    if legacy_alias_enabled:
+        ensure_dir(legacy_runs_root)
     run_id = None
     final_run_dir = None
     symlink_actions: List[str] = []
     promoted_legacy = False
     
-    def _read_manifest_inputs_hash(dir_path: Path) -> str | None:
-        """Read inputs_hash from manifest.json, return None if not found/invalid."""
-        manifest_path = dir_path / "manifest.json"
-        if not manifest_path.exists():
-            return None
-        try:
-            with manifest_path.open("r") as f:
-                data = json.load(f)
-                return data.get("inputs_hash")
-        except Exception:
-            return None
-    
+    # Collision candidates in both roots, listed once up front. With legacy
+    # aliases disabled the legacy root is never consulted, so candidates are
+    # canonical-only and nothing is promoted.
+    canonical_index = _scan_run_entries(runs_root, base_run_id)
+    legacy_index = _scan_run_entries(legacy_runs_root, base_run_id) if legacy_alias_enabled else {}
+
     def _candidate_dirs(candidate_run_id: str) -> List[Path]:
         dirs: List[Path] = []
         canonical = runs_root / candidate_run_id
         legacy = legacy_runs_root / candidate_run_id
-        if canonical.exists():
+        if _entry_exists(canonical_index.get(candidate_run_id)):
             dirs.append(canonical)
-        if legacy.exists() and legacy not in dirs:
+        if _entry_exists(legacy_index.get(candidate_run_id)) and legacy not in dirs:
             dirs.append(legacy)
         return dirs
 
     def _ensure_legacy_symlink(candidate_run_id: str) -> None:
         nonlocal symlink_actions
         global _LEGACY_ALIAS_WARNING_EMITTED
+        if not legacy_alias_enabled:
+            return
         legacy_path = legacy_runs_root / candidate_run_id
         if legacy_path.exists():
             return
@@ -332,23 +811,38 @@ def execute_instagram_copy_pipeline(repo_root: str, job_ref: str, params: Dict[s
         if existing_path == canonical_path:
             return canonical_path
 
+        canonical_entry = canonical_index.get(candidate_run_id)
+        legacy_entry = legacy_index.get(candidate_run_id)
+
         # If canonical exists, keep using canonical
-        if canonical_path.exists():
+        if _entry_exists(canonical_entry):
             return canonical_path
 
         # Promote legacy directory to canonical layout
-        if legacy_path.exists() and not legacy_path.is_symlink():
+        if legacy_entry is not None and not legacy_entry.is_symlink():
             legacy_path.rename(canonical_path)
+            del legacy_index[candidate_run_id]
             promoted_legacy = True
             _ensure_legacy_symlink(candidate_run_id)
             return canonical_path
 
-        # If legacy is symlink, rely on canonical target if available
-        if legacy_path.is_symlink() and canonical_path.exists():
-            return canonical_path
-
+        # Legacy symlink whose canonical target is missing: nothing to promote
         return existing_path
 
+    def _finalize_replay(replay_run_id: str, replay_dir: Path) -> Dict[str, Any]:
+        """Discard the staged snapshots and report an idempotent replay of replay_dir."""
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        print(
+            f"[run_header] job_id={brief.job_id} job_ref={job_ref} inputs_hash={inputs_hash} "
+            f"run_id={replay_run_id} queue_job_id={queue_job_id} doctrine={doctrine_ref.version}/{doctrine_ref.sha256}"
+        )
+        elapsed = time.monotonic() - started_monotonic
+        print(
+            f"[run_footer] status=idempotent_replay artifact_dir={replay_dir} elapsed_s={elapsed:.3f} "
+            f"actions={','.join(symlink_actions) or 'none'}"
+        )
+        return {"run_id": replay_run_id, "artifact_dir": str(replay_dir), "idempotent_replay": True}
+
     # Check base run_id across canonical + legacy locations
     base_candidates = _candidate_dirs(base_run_id)
     if not base_candidates:
@@ -360,20 +854,7 @@ def execute_instagram_copy_pipeline(repo_root: str, job_ref: str, params: Dict[s
         for candidate in base_candidates:
             existing_hash = _read_manifest_inputs_hash(candidate)
             if existing_hash == inputs_hash:
-                run_id = base_run_id
-                final_run_dir = _promote_legacy_to_canonical(base_run_id, candidate)
-                if temp_dir.exists():
-                    shutil.rmtree(temp_dir)
-                print(
-                    f"[run_header] job_id={brief.job_id} job_ref={job_ref} inputs_hash={inputs_hash} "
-                    f"run_id={run_id} queue_job_id={queue_job_id} doctrine={doctrine_ref.version}/{doctrine_ref.sha256}"
-                )
-                elapsed = time.monotonic() - started_monotonic
-                print(
-                    f"[run_footer] status=idempotent_replay artifact_dir={final_run_dir} elapsed_s={elapsed:.3f} "
-                    f"actions={','.join(symlink_actions) or 'none'}"
-                )
-                return {"run_id": run_id, "artifact_dir": str(final_run_dir), "idempotent_replay": True}
+                return _finalize_replay(base_run_id, _promote_legacy_to_canonical(base_run_id, candidate))
 
         # Different inputs_hash: scan deterministic suffixes across canonical + legacy
         suffix = 2
@@ -390,20 +871,9 @@ def execute_instagram_copy_pipeline(repo_root: str, job_ref: str, params: Dict[s
             for candidate in suffixed_candidates:
                 suffixed_hash = _read_manifest_inputs_hash(candidate)
                 if suffixed_hash == inputs_hash:
-                    run_id = suffixed_run_id
-                    final_run_dir = _promote_legacy_to_canonical(suffixed_run_id, candidate)
-                    if temp_dir.exists():
-                        shutil.rmtree(temp_dir)
-                    print(
-                        f"[run_header] job_id={brief.job_id} job_ref={job_ref} inputs_hash={inputs_hash} "
-                        f"run_id={run_id} queue_job_id={queue_job_id} doctrine={doctrine_ref.version}/{doctrine_ref.sha256}"
+                    return _finalize_replay(
+                        suffixed_run_id, _promote_legacy_to_canonical(suffixed_run_id, candidate)
                     )
-                    elapsed = time.monotonic() - started_monotonic
-                    print(
-                        f"[run_footer] status=idempotent_replay artifact_dir={final_run_dir} elapsed_s={elapsed:.3f} "
-                        f"actions={','.join(symlink_actions) or 'none'}"
-                    )
-                    return {"run_id": run_id, "artifact_dir": str(final_run_dir), "idempotent_replay": True}
 
             suffix += 1
             if suffix > 1000:
@@ -468,8 +938,8 @@ def execute_instagram_copy_pipeline(repo_root: str, job_ref: str, params: Dict[s
         input_snapshots={k: v.model_dump() for k, v in input_snapshots.items()},
         doctrine=doctrine_ref.model_dump(),
         # Legacy hashes (backward compatibility)
-        brief_hash=sha256_json(brief.model_dump(exclude={"brief_hash", "repo_commit"})),
-        context_spec_hash=sha256_json(context_spec.model_dump(exclude={"context_spec_hash"})),
+        brief_hash=hash_dict(brief_hash_dict),
+        context_spec_hash=hash_dict(context_spec_dict),
         context_content_hash=context_content_hash,
         langfuse_trace_id=trace_id,
     )
@@ -490,39 +960,20 @@ def execute_instagram_copy_pipeline(repo_root: str, job_ref: str, params: Dict[s
             response_schema_version=model_config["response_schema_version"],
             cache_enabled=model_config["cache_enabled"],
         )
-        gen_spec.generation_hash = sha256_json(gen_spec.model_dump(exclude={"generation_hash"}))
+        # One dump serves the generation_hash and every generate_text call
+        gen_spec_base = gen_spec.model_dump(exclude={"generation_hash"}, warnings=False)
+        gen_spec.generation_hash = hash_dict(gen_spec_base)
+        gen_spec_base["generation_hash"] = gen_spec.generation_hash
         manifest.generation_hash = gen_spec.generation_hash
 
-        # Format template with brief and context
+        # Format template with brief and context. Brief and context are the
+        # same for every variant (only the seed differs), so the prompt is
+        # rendered once here and shared by all generate_text calls below.
         prompt = prompt_template.format(
-            brief=f"Brand: {brief.brand}\nArtist: {brief.artist or 'N/A'}\nTitle: {brief.title or 'N/A'}\nTone: {', '.join(brief.tone_tags)}\n\nIG Settings:\nCaptions needed: {brief.ig.caption_count}\nHashtags needed: {brief.ig.hashtag_count}\nMax chars: {brief.ig.max_caption_chars}\nInclude CTA: {brief.ig.include_cta}\nInclude Emojis: {brief.ig.include_emojis}",
+            brief=_render_brief_block(brief),
             context_items=context_content,
         )
 
-        if lf is not None:
-            span_gen = lf.span(trace_id=trace_id, name="generate_instagram_copy", input={"generation_hash": gen_spec.generation_hash})
-        else:
-            span_gen = None
-
-        # Helper: parse raw text into captions
-        def _parse_captions(raw: str) -> List[IGCaption]:
-            captions: List[IGCaption] = []
-            lines = [ln.rstrip() for ln in raw.splitlines()]
-            current: List[str] = []
-            for ln in lines:
-                if ln.strip().startswith("---") and current:
-                    cap = "\n".join(current).strip()
-                    if cap:
-                        captions.append(IGCaption(caption=cap, hashtags=[]))
-                    current = []
-                else:
-                    current.append(ln)
-            if current:
-                cap = "\n".join(current).strip()
-                if cap:
-                    captions.append(IGCaption(caption=cap, hashtags=[]))
-            return captions
-
         # Stage 5: Support generation modes
         variants: List[Dict[str, Any]] = []
         seeds_used = {}
@@ -533,45 +984,68 @@ def execute_instagram_copy_pipeline(repo_root: str, job_ref: str, params: Dict[s
         else:  # variants mode
             num_variants = brief.caption_variants
         
+        # Seeds and per-variant specs are fixed up front (seed depends only on
+        # inputs_hash and the index), so the model calls can run concurrently.
+        variant_requests: List[Tuple[int, str | None, Dict[str, Any]]] = []
+        # sha256 state over the shared "<inputs_hash>:variant:" prefix; each
+        # variant copies it and appends only its index
+        seed_base = hashlib.sha256(f"{inputs_hash}:variant:".encode("utf-8"))
         for variant_idx in range(num_variants):
             # Compute deterministic seed for this variant
             if brief.generation_mode == "variants":
-                seed_input = f"{inputs_hash}:variant:{variant_idx}"
-                seed_hex = sha256_bytes(seed_input.encode("utf-8"))
-                # Extract just the hex part (strip "sha256:" prefix)
-                hex_only = seed_hex.replace("sha256:", "")
-                # Take first 8 chars of hex as integer seed
-                seed = int(hex_only[:8], 16)
+                seed_hash = seed_base.copy()
+                seed_hash.update(str(variant_idx).encode("utf-8"))
+                digest = seed_hash.digest()
+                seed_hex = "sha256:" + digest.hex()
+                # Integer seed = first 4 digest bytes, big-endian (the first 8 hex chars)
+                seed = struct.unpack_from(">I", digest, 0)[0]
                 seeds_used[variant_idx] = seed_hex
             else:
                 seed = None
-                
+                seed_hex = None
+
             # Generate with optional seed
-            gen_spec_dict = gen_spec.model_dump()
+            gen_spec_dict = dict(gen_spec_base)
             if seed is not None:
                 gen_spec_dict["seed"] = seed
+            variant_requests.append((variant_idx, seed_hex, gen_spec_dict))
+
+        with lf_span(
+            lf,
+            trace_id,
+            "generate_instagram_copy",
+            input={"generation_hash": gen_spec.generation_hash},
+        ) as span_gen:
+            def _generate(request: Tuple[int, str | None, Dict[str, Any]]) -> str:
+                return generate_text(prompt=prompt, generation_spec=request[2])
+
+            # Model calls are network-bound; map() returns results in variant order
+            if len(variant_requests) > 1:
+                with ThreadPoolExecutor(max_workers=min(len(variant_requests), 8)) as pool:
+                    raws = list(pool.map(_generate, variant_requests))
+            else:
+                raws = [_generate(r) for r in variant_requests]
+
+            for (variant_idx, seed_hex, _), raw in zip(variant_requests, raws):
+                captions = _parse_captions(raw)
                 
-            raw = generate_text(prompt=prompt, generation_spec=gen_spec_dict)
-            captions = _parse_captions(raw)
-            
-            # Enforce count (truncate/pad)
-            captions = captions[: brief.ig.caption_count]
-            while len(captions) < brief.ig.caption_count:
-                captions.append(IGCaption(caption="", hashtags=[]))
-            
-            pkg = IGCopyPackage(
-                job_id=brief.job_id,
-                brand=brief.brand,
-                captions=captions,
-            )
-            variants.append({
-                "variant_index": variant_idx,
-                "seed": seed_hex if seed is not None else None,
-                "captions": [c.model_dump() for c in pkg.captions],
-            })
+                # Enforce count (truncate/pad)
+                captions = captions[: brief.ig.caption_count]
+                while len(captions) < brief.ig.caption_count:
+                    captions.append(IGCaption(caption="", hashtags=[]))
+                
+                pkg = IGCopyPackage(
+                    job_id=brief.job_id,
+                    brand=brief.brand,
+                    captions=captions,
+                )
+                variants.append({
+                    "variant_index": variant_idx,
+                    "seed": seed_hex,
+                    "captions": [c.model_dump() for c in pkg.captions],
+                })
 
-        if span_gen is not None:
-            span_gen.end(output={"variants_count": len(variants)})
+            span_gen.output = {"variants_count": len(variants)}
 
         # Record seed metadata in manifest if variants mode
         if brief.generation_mode == "variants":
@@ -592,51 +1066,31 @@ def execute_instagram_copy_pipeline(repo_root: str, job_ref: str, params: Dict[s
         primary_variant = variants[0]
         
         # Mode A (single) & Mode B (variants): write markdown with primary variant for backward compatibility
-        md_lines: List[str] = [f"# Instagram Captions ({brief.brand})", f"- job_id: {brief.job_id}", f"- run_id: {run_id}", ""]
+        md_header: List[str] = [f"# Instagram Captions ({brief.brand})", f"- job_id: {brief.job_id}", f"- run_id: {run_id}", ""]
         
         if brief.generation_mode == "variants":
-            md_lines.append(f"- generation_mode: variants")
-            md_lines.append(f"- total_variants: {num_variants}")
-            md_lines.append("")
-        
-        for i, cap_dict in enumerate(primary_variant["captions"], 1):
-            md_lines.append(f"## Caption {i}")
-            md_lines.append(cap_dict["caption"].strip())
-            md_lines.append("")
+            md_header.append(f"- generation_mode: variants")
+            md_header.append(f"- total_variants: {num_variants}")
+            md_header.append("")
         
-        out_md = "\n".join(md_lines).strip() + "\n"
-        out_path = temp_dir / "outputs" / "instagram_captions.md"
-        write_text(out_path, out_md)
-        
-        # Record artifact hashes
-        out_hash = sha256_bytes(out_md.encode("utf-8"))
-        manifest.artifacts["outputs/instagram_captions.md"] = {"sha256": out_hash, "bytes": len(out_md.encode('utf-8'))}
+        out_md = _render_md(md_header, primary_variant["captions"])
+        manifest.artifacts["outputs/instagram_captions.md"] = _emit_artifact(
+            temp_dir, "outputs/instagram_captions.md", out_md
+        )
         
         # Mode B (variants): write individual variant files
         if brief.generation_mode == "variants" and num_variants > 1:
-            variants_dir = temp_dir / "outputs" / "variants"
-            ensure_dir(variants_dir)
-            
             for variant_data in variants:
                 var_idx = variant_data["variant_index"]
-                var_lines: List[str] = [f"# Variant {var_idx + 1}", ""]
-                for i, cap_dict in enumerate(variant_data["captions"], 1):
-                    var_lines.append(f"## Caption {i}")
-                    var_lines.append(cap_dict["caption"].strip())
-                    var_lines.append("")
-                var_md = "\n".join(var_lines).strip() + "\n"
-                
-                var_path = variants_dir / f"{var_idx + 1:02d}.md"
-                write_text(var_path, var_md)
-                var_hash = sha256_bytes(var_md.encode("utf-8"))
-                manifest.artifacts[f"outputs/variants/{var_idx + 1:02d}.md"] = {"sha256": var_hash, "bytes": len(var_md.encode('utf-8'))}
+                var_md = _render_md([f"# Variant {var_idx + 1}", ""], variant_data["captions"])
+                var_rel_path = f"outputs/variants/{var_idx + 1:02d}.md"
+                manifest.artifacts[var_rel_path] = _emit_artifact(temp_dir, var_rel_path, var_md)
             
             # Write variants.json with full data
-            variants_json = json.dumps(variants, indent=2, ensure_ascii=False)
-            variants_json_path = variants_dir / "variants.json"
-            write_text(variants_json_path, variants_json)
-            var_json_hash = sha256_bytes(variants_json.encode("utf-8"))
-            manifest.artifacts["outputs/variants/variants.json"] = {"sha256": var_json_hash, "bytes": len(variants_json.encode('utf-8'))}
+            variants_json = orjson.dumps(variants, option=orjson.OPT_INDENT_2)
+            manifest.artifacts["outputs/variants/variants.json"] = _emit_artifact(
+                temp_dir, "outputs/variants/variants.json", variants_json
+            )
         
         # Mode C (format): write additional output formats
         if brief.generation_mode == "format":
@@ -648,11 +1102,10 @@ def execute_instagram_copy_pipeline(repo_root: str, job_ref: str, params: Dict[s
                     "brand": brief.brand,
                     "captions": primary_captions,
                 }
-                json_text = json.dumps(json_data, indent=2, ensure_ascii=False)
-                json_path = temp_dir / "outputs" / "instagram_captions.json"
-                write_text(json_path, json_text)
-                json_hash = sha256_bytes(json_text.encode("utf-8"))
-                manifest.artifacts["outputs/instagram_captions.json"] = {"sha256": json_hash, "bytes": len(json_text.encode('utf-8'))}
+                json_payload = orjson.dumps(json_data, option=orjson.OPT_INDENT_2)
+                manifest.artifacts["outputs/instagram_captions.json"] = _emit_artifact(
+                    temp_dir, "outputs/instagram_captions.json", json_payload
+                )
             
             if "yaml" in brief.output_formats:
                 yaml_data = {
@@ -660,11 +1113,12 @@ def execute_instagram_copy_pipeline(repo_root: str, job_ref: str, params: Dict[s
                     "brand": brief.brand,
                     "captions": primary_captions,
                 }
+                # Output stays on the pure-Python emitter: libyaml folds long quoted
+                # scalars differently, so artifact bytes would depend on the install
                 yaml_text = yaml.safe_dump(yaml_data, default_flow_style=False, sort_keys=False)
-                yaml_path = temp_dir / "outputs" / "instagram_captions.yaml"
-                write_text(yaml_path, yaml_text)
-                yaml_hash = sha256_bytes(yaml_text.encode("utf-8"))
-                manifest.artifacts["outputs/instagram_captions.yaml"] = {"sha256": yaml_hash, "bytes": len(yaml_text.encode('utf-8'))}
+                manifest.artifacts["outputs/instagram_captions.yaml"] = _emit_artifact(
+                    temp_dir, "outputs/instagram_captions.yaml", yaml_text
+                )
 
         manifest.status = "succeeded"
         manifest.finished_at = _utc_now()
@@ -676,17 +1130,19 @@ def execute_instagram_copy_pipeline(repo_root: str, job_ref: str, params: Dict[s
         failed_exc = e
     finally:
         # Always write manifest
-        write_json(temp_dir / "manifest.json", json.loads(manifest.model_dump_json()))
+        write_bytes_atomic(temp_dir / "manifest.json", manifest_bytes(manifest))
 
-    # Atomically rename completed temp run to canonical destination
+    # Atomically rename completed temp run to canonical destination (same
+    # filesystem, checked at startup). On failure, e.g. the destination was
+    # created concurrently, drop the staged copy.
     try:
-        temp_dir.rename(final_run_dir)
-    except Exception as rename_error:
-        if temp_dir.exists():
-            shutil.rmtree(temp_dir)
+        os.replace(temp_dir, final_run_dir)
+    except OSError as rename_error:
+        shutil.rmtree(temp_dir, ignore_errors=True)
         raise RuntimeError(f"Failed to atomically finalize run directory {final_run_dir}: {rename_error}") from rename_error
 
     _ensure_legacy_symlink(run_id)
+    index_run(artifacts_root, brief.job_id, run_id)
 
     elapsed = time.monotonic() - started_monotonic
     actions = []
@@ -1,10 +1,8 @@
-from rq import Queue
-from redis import Redis
-import os
+from sigilzero.jobs import get_queue, get_redis
 
-# Keep existing queue wiring (known-good)
-redis_conn = Redis.from_url(os.getenv("REDIS_URL", "redis://redis:6379/0"))
-queue = Queue("sigilzero", connection=redis_conn)
+# Keep existing queue wiring (known-good); shares the process-wide pool in sigilzero.jobs
+redis_conn = get_redis()
+queue = get_queue()
 
 def example_job():
     print("Worker is alive.")